@@ -0,0 +1,239 @@
+"""
+Benchmark the classifier pipeline on synthetic ZIP datasets.
+
+    python -m benchmarks.run --files 500 --sizes 500,5000 --languages en,fr --stub
+    python -m benchmarks.run --stub --output current.json --baseline baseline.json
+
+Each stage runs in a fresh process so its peak RSS is its own. Results are
+written as JSON and, with --baseline, compared against an earlier run.
+"""
+
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import VOCABULARY, build_dataset
+
+STAGES = ("zip_read", "evaluate_text", "classify_text", "process_zip_file")
+
+DEFAULT_RULES = [
+    {"name": "language", "value": "English", "weight": 0.3},
+    {"name": "min_length", "value": 50, "weight": 0.2},
+    {"name": "toxicity", "value": "low", "weight": 0.3},
+    {"name": "prohibited_keywords", "value": ["password", "ssn"], "weight": 0.2},
+]
+LABELS = ["english", "non-toxic"]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _calls(stage: str, dataset: str, members: int, contents: list[str], group: int):
+    """The timed calls of a stage, as (files, zero-argument callable) pairs."""
+    from classifier.evaluate_text import evaluate_text_batch
+    from classifier.ml_classifier import classify_batch
+    from classifier.rule_plan import compile_rules
+    from services.read_files import iter_zip_members, process_zip_file
+
+    plan = compile_rules(DEFAULT_RULES)
+
+    if stage == "zip_read":
+        reader = iter_zip_members(dataset)
+        return [(1, lambda: next(reader, None)) for _ in range(members)]
+
+    groups = [contents[i : i + group] for i in range(0, len(contents), group)]
+    if stage == "evaluate_text":
+        return [(len(g), lambda g=g: evaluate_text_batch(g, plan)) for g in groups]
+    if stage == "classify_text":
+        return [(len(g), lambda g=g: classify_batch(g, LABELS)) for g in groups]
+    return [(members, lambda: process_zip_file(dataset, plan))]
+
+
+def run_stage(stage: str, dataset: str, options: dict) -> dict:
+    """Run one stage `repeat` times with cold caches and summarize it."""
+    # benchmarks measure inference, never results persisted by an earlier run
+    os.environ["PRAXIS_RESULT_CACHE_PATH"] = ""
+    if options["stub"]:
+        # worker processes would load the real model
+        os.environ["PRAXIS_WORKERS"] = "0"
+        from benchmarks.stub_models import install_stub_models
+
+        install_stub_models(options["stub_latency_ms"])
+
+    from classifier.cache import clear_caches
+    from services.read_files import iter_zip_members
+
+    # structured members arrive as lists of record texts; benchmark each record
+    items = list(iter_zip_members(dataset))
+    contents = [
+        text
+        for _, content in items
+        for text in (content if isinstance(content, list) else [content])
+    ]
+    group = options["group"]
+
+    # load models and compile lazily built state outside the measurement
+    warm_texts = contents[: min(group, 4)]
+    if stage in ("evaluate_text", "classify_text", "process_zip_file") and warm_texts:
+        from classifier.evaluate_text import evaluate_text_batch
+        from classifier.ml_classifier import classify_batch
+
+        evaluate_text_batch(warm_texts, DEFAULT_RULES)
+        classify_batch(warm_texts, LABELS)
+
+    rss_start = peak_rss_mb()
+    latencies, files, elapsed = [], 0, 0.0
+    for _ in range(options["repeat"]):
+        clear_caches()
+        for count, call in _calls(stage, dataset, len(items), contents, group):
+            started = time.perf_counter()
+            call()
+            duration = time.perf_counter() - started
+            latencies.append(duration)
+            files += count
+            elapsed += duration
+
+    return {
+        "calls": len(latencies),
+        "files": files,
+        "seconds": round(elapsed, 4),
+        "files_per_sec": round(files / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "rss_start_mb": rss_start,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[dict]:
+    """
+    Stages where throughput dropped, or p99 latency or peak RSS grew, by more
+    than `tolerance` (a fraction) relative to the baseline.
+    """
+    regressions = []
+    checks = (("files_per_sec", -1), ("p99_ms", 1), ("peak_rss_mb", 1))
+    for stage, result in current["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before:
+            continue
+        for metric, direction in checks:
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if change * direction > tolerance:
+                regressions.append(
+                    {
+                        "stage": stage,
+                        "metric": metric,
+                        "baseline": old,
+                        "current": new,
+                        "change": round(change, 3),
+                    }
+                )
+    return regressions
+
+
+def _csv(value: str) -> tuple[str, ...]:
+    return tuple(part.strip() for part in value.split(",") if part.strip())
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the classifier pipeline.")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--sizes", default="2000", help="comma-separated document sizes in bytes")
+    parser.add_argument("--languages", default="en", help=f"any of {','.join(VOCABULARY)}")
+    parser.add_argument("--extensions", default=".txt")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stages", default=",".join(STAGES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--group", type=int, default=16, help="documents per batched call")
+    parser.add_argument("--stub", action="store_true", help="use stub models (offline)")
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0)
+    parser.add_argument("--output", default=None, help="write results JSON here")
+    parser.add_argument("--baseline", default=None, help="results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    stages = _csv(args.stages)
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    options = {
+        "stub": args.stub,
+        "stub_latency_ms": args.stub_latency_ms,
+        "repeat": max(1, args.repeat),
+        "group": max(1, args.group),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset = build_dataset(
+            os.path.join(tmp, "dataset.zip"),
+            files=args.files,
+            sizes=tuple(int(size) for size in _csv(args.sizes)),
+            languages=_csv(args.languages),
+            extensions=_csv(args.extensions),
+            seed=args.seed,
+        )
+
+        results = {}
+        context = multiprocessing.get_context("spawn")
+        for stage in stages:
+            with concurrent.futures.ProcessPoolExecutor(1, mp_context=context) as pool:
+                results[stage] = pool.submit(
+                    run_stage, stage, dataset["path"], options
+                ).result()
+            print(f"{stage:>16}: {json.dumps(results[stage])}", file=sys.stderr)
+
+    report = {
+        "created_at": time.time(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "backend": os.getenv("PRAXIS_BACKEND", "torch"),
+            "model": "stub" if args.stub else os.getenv("PRAXIS_MODEL_ID", "default"),
+        },
+        "dataset": {key: value for key, value in dataset.items() if key != "path"},
+        "options": options,
+        "stages": results,
+    }
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["regressions"] = compare(report, json.load(f), args.tolerance)
+        status = 1 if report["regressions"] else 0
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import re
+import time
+import zlib
+
+from benchmarks.synthetic import TOXIC_WORDS
+
+
+def _score(*parts: str) -> float:
+    """Deterministic pseudo-score in [0, 1) derived from the inputs."""
+    return (zlib.crc32("\x00".join(parts).encode("utf-8")) % 1000) / 1000
+
+
+class StubTokenizer:
+    """Whitespace tokenizer with a growing vocabulary, enough for chunking."""
+
+    model_max_length = 512
+
+    def __init__(self):
+        self._ids = {}
+        self._words = []
+
+    def _encode(self, text: str) -> tuple[list[int], list[tuple[int, int]]]:
+        ids, offsets = [], []
+        for match in re.finditer(r"\S+", text):
+            word = match.group()
+            if word not in self._ids:
+                self._ids[word] = len(self._words)
+                self._words.append(word)
+            ids.append(self._ids[word])
+            offsets.append(match.span())
+        return ids, offsets
+
+    def __call__(self, texts, return_offsets_mapping: bool = False, **kwargs):
+        single = isinstance(texts, str)
+        encoded = [self._encode(text) for text in ([texts] if single else texts)]
+        result = {"input_ids": [ids for ids, _ in encoded]}
+        if return_offsets_mapping:
+            result["offset_mapping"] = [offsets for _, offsets in encoded]
+        return {key: value[0] for key, value in result.items()} if single else result
+
+    def decode(self, ids) -> str:
+        return " ".join(self._words[i] for i in ids)
+
+
+class StubZeroShotEngine:
+    """Stands in for ZeroShotEngine; costs `latency_ms` per (text, label) pair."""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+
+    def classify(self, texts, candidate_labels, multi_label=True) -> list[dict]:
+        if self.latency_ms:
+            time.sleep(self.latency_ms * len(texts) * len(candidate_labels) / 1000)
+        results = []
+        for text in texts:
+            scores = {label: _score(text, label) for label in candidate_labels}
+            if not multi_label:
+                total = sum(scores.values()) or 1.0
+                scores = {label: score / total for label, score in scores.items()}
+            results.append(scores)
+        return results
+
+
+class StubToxicityPipeline:
+    """Stands in for the text-classification pipeline; costs `latency_ms` per text."""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+
+    def _labels(self, text: str) -> list[dict]:
+        lowered = text.lower()
+        toxic = any(word in lowered for word in TOXIC_WORDS)
+        score = 0.5 + _score(text) / 2
+        return [
+            {"label": "toxic" if toxic else "non-toxic", "score": score},
+            {"label": "non-toxic" if toxic else "toxic", "score": 1 - score},
+        ]
+
+    def __call__(self, texts, batch_size=1, top_k=1, **kwargs):
+        if self.latency_ms:
+            time.sleep(self.latency_ms * len(texts) / 1000)
+        outputs = [self._labels(text) for text in texts]
+        if top_k is None:
+            return outputs
+        return [output[0] for output in outputs]
+
+
+def install_stub_models(latency_ms: float = 0.0) -> None:
+    """
+    Route zero-shot and toxicity inference to the stubs above, so the rest
+    of the pipeline (decoding, caching, batching, rules, language ID) runs
+    for real without downloading or loading model weights.
+    """
+    import classifier.evaluate_text as evaluate_text
+    import classifier.ml_classifier as ml_classifier
+
+    tokenizer = StubTokenizer()
+    engine = StubZeroShotEngine(latency_ms)
+    pipe = StubToxicityPipeline(latency_ms)
+
+    ml_classifier.get_zero_shot_engine = lambda model_id=None: engine
+    ml_classifier.get_model = lambda model_id=None: (None, tokenizer)
+    evaluate_text.get_toxicity_pipeline = lambda: pipe
+    evaluate_text.get_model = lambda model_id=None: (None, tokenizer)
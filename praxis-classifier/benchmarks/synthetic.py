@@ -0,0 +1,81 @@
+import json
+import random
+import zipfile
+
+# Small per-language vocabularies; enough for language ID to tell them apart
+VOCABULARY = {
+    "en": "the data model is a good example of clean text and it works well for "
+    "training with many useful records from people who write about their work",
+    "fr": "le modèle de données est un bon exemple de texte propre et il fonctionne "
+    "bien pour les personnes qui écrivent sur leur travail avec des fichiers",
+    "de": "das Datenmodell ist ein gutes Beispiel für sauberen Text und es funktioniert "
+    "gut für Menschen die über ihre Arbeit mit vielen Dateien schreiben",
+    "es": "el modelo de datos es un buen ejemplo de texto limpio y funciona bien "
+    "para las personas que escriben sobre su trabajo con muchos archivos",
+}
+TOXIC_WORDS = ("idiot", "stupid", "hate")
+
+
+def make_text(rng: random.Random, lang: str, size_bytes: int, toxic_rate: float = 0.0) -> str:
+    """Random sentences in `lang`, roughly `size_bytes` long."""
+    words = VOCABULARY[lang].split()
+    parts, length = [], 0
+    while length < size_bytes:
+        sentence = " ".join(rng.choice(words) for _ in range(rng.randint(6, 16)))
+        if toxic_rate and rng.random() < toxic_rate:
+            sentence += " " + rng.choice(TOXIC_WORDS)
+        sentence = sentence.capitalize() + "."
+        parts.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(parts)
+
+
+def _render(text: str, extension: str) -> str:
+    """Structured extensions get one record per sentence."""
+    sentences = text.split(". ")
+    if extension == ".json":
+        return json.dumps([{"id": i, "text": line} for i, line in enumerate(sentences)])
+    if extension in (".jsonl", ".ndjson"):
+        return "\n".join(
+            json.dumps({"id": i, "text": line}) for i, line in enumerate(sentences)
+        )
+    if extension == ".csv":
+        return "id,text\n" + "\n".join(f'{i},"{line}"' for i, line in enumerate(sentences))
+    return text
+
+
+def build_dataset(
+    path: str,
+    files: int = 100,
+    sizes: tuple[int, ...] = (2_000,),
+    languages: tuple[str, ...] = ("en",),
+    extensions: tuple[str, ...] = (".txt",),
+    toxic_rate: float = 0.05,
+    seed: int = 0,
+) -> dict:
+    """
+    Write a ZIP of `files` synthetic documents to `path`. Sizes, languages
+    and extensions are drawn uniformly from the given choices with a fixed
+    seed, so the same arguments always produce the same archive.
+    Returns a summary of what was written.
+    """
+    rng = random.Random(seed)
+    total_bytes = 0
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        for i in range(files):
+            lang = rng.choice(languages)
+            extension = rng.choice(extensions)
+            text = make_text(rng, lang, rng.choice(sizes), toxic_rate)
+            data = _render(text, extension).encode("utf-8")
+            z.writestr(f"docs/{lang}/{i:06d}{extension}", data)
+            total_bytes += len(data)
+
+    return {
+        "path": path,
+        "files": files,
+        "bytes": total_bytes,
+        "sizes": list(sizes),
+        "languages": list(languages),
+        "extensions": list(extensions),
+        "seed": seed,
+    }
@@ -0,0 +1,216 @@
+import argparse
+import os
+import sys
+from abc import ABC, abstractmethod
+
+from config import BACKEND_MODEL_PATH, INFERENCE_BACKEND, MODEL_ID
+
+
+def _dir_bytes(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path)
+        for name in names
+        if name.endswith(".onnx")
+    )
+
+
+class InferenceBackend(ABC):
+    """
+    Loads the (model, tokenizer) pair the pipelines run on. Implementations
+    decide the runtime; the pipelines and everything above them are shared.
+    """
+
+    name = "base"
+
+    def default_path(self, model_id: str) -> str:
+        """
+        Local directory for exported artifacts of `model_id`; one per model and
+        backend, also under PRAXIS_BACKEND_MODEL_PATH, so exports never overwrite
+        each other and a changed PRAXIS_MODEL_ID never loads another model's graph.
+        """
+        directory = f"{model_id.replace('/', '--')}-{self.name}"
+        return os.path.join(BACKEND_MODEL_PATH or "models", directory)
+
+    @abstractmethod
+    def load(self, model_id: str):
+        """Return the (model, tokenizer) pair for `model_id`."""
+
+    @abstractmethod
+    def memory_bytes(self, model) -> int:
+        """Memory the loaded model takes, in bytes."""
+
+    @abstractmethod
+    def export(self, model_id: str, output_dir: str) -> str:
+        """Write the artifacts this backend loads to `output_dir` and return it."""
+
+
+class TorchBackend(InferenceBackend):
+    """Plain PyTorch weights from the Hugging Face hub, run on CPU."""
+
+    name = "torch"
+
+    def load(self, model_id: str):
+        import torch
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+        torch.set_default_device("cpu")
+        tokenizer = AutoTokenizer.from_pretrained(model_id)
+        model = AutoModelForSequenceClassification.from_pretrained(model_id)
+        model.eval()
+        return model, tokenizer
+
+    def memory_bytes(self, model) -> int:
+        """Resident size of the model weights and buffers, in bytes."""
+        tensors = list(model.parameters()) + list(model.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+
+    def export(self, model_id: str, output_dir: str) -> str:
+        model, tokenizer = self.load(model_id)
+        model.save_pretrained(output_dir)
+        tokenizer.save_pretrained(output_dir)
+        return output_dir
+
+
+class OnnxBackend(InferenceBackend):
+    """ONNX Runtime on CPU, via optimum's ORTModelForSequenceClassification."""
+
+    name = "onnx"
+
+    def load(self, model_id: str):
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+        from transformers import AutoTokenizer
+
+        path = self.default_path(model_id)
+        # the exact graph this backend loads, not any .onnx file in the directory
+        if not os.path.isfile(os.path.join(path, self.file_name(path))):
+            self.export(model_id, path)
+
+        tokenizer = AutoTokenizer.from_pretrained(path)
+        model = ORTModelForSequenceClassification.from_pretrained(
+            path, file_name=self.file_name(path), provider="CPUExecutionProvider"
+        )
+        return model, tokenizer
+
+    def file_name(self, path: str) -> str:
+        return "model.onnx"
+
+    def memory_bytes(self, model) -> int:
+        """Size of the loaded ONNX graph on disk, which ONNX Runtime maps into memory."""
+        save_dir = getattr(model, "model_save_dir", None)
+        if not save_dir:
+            return 0
+        graph = os.path.join(str(save_dir), self.file_name(str(save_dir)))
+        return os.path.getsize(graph) if os.path.isfile(graph) else _dir_bytes(str(save_dir))
+
+    def export(self, model_id: str, output_dir: str) -> str:
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+        from transformers import AutoTokenizer
+
+        model = ORTModelForSequenceClassification.from_pretrained(model_id, export=True)
+        model.save_pretrained(output_dir)
+        AutoTokenizer.from_pretrained(model_id).save_pretrained(output_dir)
+        return output_dir
+
+
+class QuantizedOnnxBackend(OnnxBackend):
+    """ONNX export with dynamic INT8 quantization of the weights."""
+
+    name = "onnx-int8"
+
+    def file_name(self, path: str) -> str:
+        return "model_quantized.onnx"
+
+    def export(self, model_id: str, output_dir: str) -> str:
+        from optimum.onnxruntime import ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+        super().export(model_id, output_dir)
+        quantizer = ORTQuantizer.from_pretrained(output_dir, file_name="model.onnx")
+        # Dynamic quantization: weights stored as INT8, activations quantized at runtime
+        qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+        quantizer.quantize(save_dir=output_dir, quantization_config=qconfig)
+        return output_dir
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (TorchBackend, OnnxBackend, QuantizedOnnxBackend)
+}
+
+
+def get_backend(name: str = INFERENCE_BACKEND):
+    """Instantiate the configured backend; unknown names raise ValueError."""
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown inference backend {name!r}; expected one of {sorted(BACKENDS)}"
+        )
+    return BACKENDS[name]()
+
+
+PARITY_TEXTS = [
+    "This dataset contains English product reviews written by customers.",
+    "Ce texte est écrit en français et parle de cuisine.",
+    "You are an idiot and everyone hates you.",
+    "The quarterly report shows revenue growth across all regions.",
+]
+PARITY_LABELS = ["english", "non-toxic"]
+
+
+def check_parity(name: str, model_id: str = MODEL_ID, tolerance: float = 0.05) -> dict:
+    """
+    Score PARITY_TEXTS with the PyTorch backend and with `name`, and report the
+    largest per-label difference in zero-shot scores.
+    """
+    from transformers import pipeline
+
+    def scores(backend) -> list[dict]:
+        model, tokenizer = backend.load(model_id)
+        pipe = pipeline("zero-shot-classification", model=model, tokenizer=tokenizer, device=-1)
+        outputs = pipe(PARITY_TEXTS, PARITY_LABELS, multi_label=True)
+        return [dict(zip(o["labels"], o["scores"])) for o in outputs]
+
+    reference = scores(TorchBackend())
+    candidate = scores(get_backend(name))
+    max_diff = max(
+        abs(ref[label] - cand[label])
+        for ref, cand in zip(reference, candidate)
+        for label in PARITY_LABELS
+    )
+    return {
+        "backend": name,
+        "max_abs_diff": round(max_diff, 4),
+        "tolerance": tolerance,
+        "passed": max_diff <= tolerance,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export and check inference backends.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="export model artifacts to a local path")
+    export.add_argument("--backend", default=INFERENCE_BACKEND, choices=sorted(BACKENDS))
+    export.add_argument("--model", default=MODEL_ID)
+    export.add_argument("--output", default=None)
+
+    parity = commands.add_parser("parity", help="compare a backend against PyTorch")
+    parity.add_argument("--backend", default=INFERENCE_BACKEND, choices=sorted(BACKENDS))
+    parity.add_argument("--model", default=MODEL_ID)
+    parity.add_argument("--tolerance", type=float, default=0.05)
+
+    args = parser.parse_args(argv)
+    backend = get_backend(args.backend)
+
+    if args.command == "export":
+        output = args.output or backend.default_path(args.model)
+        print(f"Exported {args.model} ({backend.name}) to {backend.export(args.model, output)}")
+        return 0
+
+    result = check_parity(args.backend, args.model, args.tolerance)
+    print(result)
+    return 0 if result["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
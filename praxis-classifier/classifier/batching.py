@@ -0,0 +1,34 @@
+def length_buckets(texts: list[str], batch_size: int) -> list[list[int]]:
+    """
+    Group text indices into batches of similar length.
+    Sorting by length keeps padding inside each batch to a minimum.
+    """
+    batch_size = max(1, int(batch_size))
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    return [order[i : i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def run_bucketed(func, texts: list[str], batch_size: int) -> list:
+    """
+    Call `func(batch_texts)` once per length bucket and scatter the
+    per-item results back to the original order of `texts`.
+    """
+    results = [None] * len(texts)
+    for bucket in length_buckets(texts, batch_size):
+        outputs = func([texts[i] for i in bucket])
+        for index, output in zip(bucket, outputs):
+            results[index] = output
+    return results
+
+
+def batched(iterable, size: int):
+    """Yield lists of up to `size` items from any iterable, lazily."""
+    size = max(1, int(size))
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
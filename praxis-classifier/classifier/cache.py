@@ -0,0 +1,148 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from config import CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS, INFERENCE_BACKEND
+from metrics import register_collector
+
+_MISSING = object()
+_caches = {}  # name -> TTLCache, for stats reporting
+
+
+def content_key(*parts) -> str:
+    """SHA-256 of the given parts, so keys depend on the full content, not a prefix."""
+    digest = hashlib.sha256()
+    for part in parts:
+        text = part if isinstance(part, str) else repr(part)
+        digest.update(text.encode("utf-8", errors="ignore"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with a maximum size and per-entry time to live.
+    Tracks hit, miss and eviction counters.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        ttl_seconds: float = CACHE_TTL_SECONDS,
+    ):
+        self.name = name
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = ttl_seconds
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        _caches[name] = self
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value) -> None:
+        expires_at = (
+            time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else None
+        )
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+def cache_stats() -> dict:
+    """Counters for every cache created in this process."""
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+def clear_caches() -> None:
+    """Empty every in-memory cache (counters are kept)."""
+    for cache in list(_caches.values()):
+        cache.clear()
+
+
+def _cache_samples() -> list:
+    samples = []
+    for name, stats in cache_stats().items():
+        labels = {"cache": name}
+        for counter in ("hits", "misses", "evictions", "expirations"):
+            name = f"praxis_cache_{counter}_total"
+            samples.append((name, "counter", f"Cache {counter}.", labels, stats[counter]))
+        samples.append(("praxis_cache_size", "gauge", "Entries held.", labels, stats["size"]))
+        samples.append(
+            ("praxis_cache_hit_rate", "gauge", "Hit rate.", labels, stats["hit_rate"])
+        )
+    return samples
+
+
+register_collector(_cache_samples)
+
+
+def inference_key(
+    kind: str,
+    text: str,
+    model_id: str,
+    labels: tuple = (),
+    multi_label: bool = False,
+) -> str:
+    """
+    Cache key for a model result: SHA-256 over the whitespace-normalized text,
+    the model id, the inference backend (PRAXIS_BACKEND), the
+    (order-independent) label set and the multi_label flag.
+    """
+    normalized = " ".join(text.split())
+    return content_key(
+        kind,
+        normalized,
+        model_id,
+        INFERENCE_BACKEND,
+        tuple(sorted(labels)),
+        bool(multi_label),
+    )
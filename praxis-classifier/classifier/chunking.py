@@ -0,0 +1,114 @@
+import math
+
+from config import (
+    CHUNK_MAX_WINDOWS,
+    CHUNK_OVERLAP_TOKENS,
+    CHUNK_POOLING,
+    CHUNK_WINDOW_TOKENS,
+)
+
+POOLING_MODES = ("max", "mean", "attention")
+
+
+def chunking_enabled(pooling: str = CHUNK_POOLING) -> bool:
+    return pooling in POOLING_MODES
+
+
+def chunking_signature(pooling: str = CHUNK_POOLING) -> str:
+    """Part of the cache key, so results from different chunk settings never mix."""
+    if not chunking_enabled(pooling):
+        return "prefix512"
+    return f"{pooling}:{CHUNK_WINDOW_TOKENS}:{CHUNK_OVERLAP_TOKENS}:{CHUNK_MAX_WINDOWS}"
+
+
+def window_starts(
+    n_tokens: int,
+    window: int = CHUNK_WINDOW_TOKENS,
+    overlap: int = CHUNK_OVERLAP_TOKENS,
+    max_windows: int = CHUNK_MAX_WINDOWS,
+) -> list[int]:
+    """
+    Token offsets of overlapping windows covering `n_tokens`. When more than
+    `max_windows` would be needed, that many windows are spread evenly over
+    the document instead, so the cost per document stays bounded.
+    """
+    if n_tokens <= window:
+        return [0]
+    step = max(1, window - overlap)
+    count = math.ceil((n_tokens - window) / step) + 1
+    last = n_tokens - window
+    if count <= max_windows:
+        return [min(i * step, last) for i in range(count)]
+    if max_windows <= 1:
+        return [0]
+    return [round(i * last / (max_windows - 1)) for i in range(max_windows)]
+
+
+def split_windows(texts: list[str], tokenizer) -> tuple[list[str], list[int], list[int]]:
+    """
+    Cut each text into windows of about CHUNK_WINDOW_TOKENS tokens. Window
+    boundaries come from the tokenizer's character offsets, and each window
+    is that slice of the original text, so no text is rebuilt from token
+    ids. The model tokenizes the windows again. Needs a fast tokenizer.
+    Returns (window_texts, owner_index, window_token_counts), flattened over
+    all texts so every window can run in one batch.
+    """
+    windows, owners, sizes = [], [], []
+    encoded = tokenizer(
+        texts, add_special_tokens=False, truncation=False, return_offsets_mapping=True
+    )
+    for owner, offsets in enumerate(encoded["offset_mapping"]):
+        text = texts[owner]
+        if not offsets:
+            windows.append(text)
+            owners.append(owner)
+            sizes.append(1)
+            continue
+        for start in window_starts(len(offsets)):
+            end = min(start + CHUNK_WINDOW_TOKENS, len(offsets))
+            windows.append(text[offsets[start][0] : offsets[end - 1][1]])
+            owners.append(owner)
+            sizes.append(end - start)
+    return windows, owners, sizes
+
+
+def pool_scores(
+    window_scores: list[dict], sizes: list[int], pooling: str = CHUNK_POOLING
+) -> dict:
+    """
+    Combine per-window {label: score} dicts into one dict per document.
+    - max: the strongest window decides.
+    - mean: average weighted by window length in tokens.
+    - attention: softmax over each label's window scores, so confident
+      windows dominate without discarding the rest.
+    """
+    if len(window_scores) == 1:
+        return dict(window_scores[0])
+
+    pooled = {}
+    for label in window_scores[0]:
+        values = [scores.get(label, 0.0) for scores in window_scores]
+        if pooling == "max":
+            pooled[label] = max(values)
+        elif pooling == "attention":
+            weights = [math.exp(v * 5.0) for v in values]
+            pooled[label] = sum(w * v for w, v in zip(weights, values)) / sum(weights)
+        else:
+            pooled[label] = sum(s * v for s, v in zip(sizes, values)) / sum(sizes)
+    return pooled
+
+
+def run_chunked(func, texts: list[str], tokenizer, pooling: str = CHUNK_POOLING) -> list[dict]:
+    """
+    Score long texts window by window. `func(window_texts)` must return one
+    {label: score} dict per window; the windows of every text go through it
+    together and are pooled back into one dict per text.
+    """
+    windows, owners, sizes = split_windows(texts, tokenizer)
+    window_scores = func(windows)
+
+    grouped = [([], []) for _ in texts]
+    for owner, scores, size in zip(owners, window_scores, sizes):
+        grouped[owner][0].append(scores)
+        grouped[owner][1].append(size)
+    return [pool_scores(scores, sizes, pooling) for scores, sizes in grouped]
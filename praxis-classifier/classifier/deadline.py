@@ -0,0 +1,108 @@
+import concurrent.futures
+import threading
+import time
+
+from config import INFERENCE_TIMEOUT_SECONDS, INFERENCE_WORKERS, MODEL_CONCURRENCY
+from metrics import inc
+
+_executors = {}  # model name -> thread pool, reused across calls
+_executors_lock = threading.Lock()
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class Deadline:
+    """
+    A per-request time budget passed down the pipeline. Stages check it
+    between units of work and bound blocking calls with `timeout()`; any
+    stage that substitutes a fallback result calls `degrade()`, so the
+    response can be marked partial.
+    """
+
+    def __init__(self, seconds: float | None):
+        # monotonic is system-wide, so the deadline survives pickling into workers
+        self.expires_at = None if not seconds or seconds <= 0 else time.monotonic() + seconds
+        self.reasons = []
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return {"expires_at": self.expires_at, "reasons": list(self.reasons)}
+
+    def __setstate__(self, state):
+        self.expires_at = state["expires_at"]
+        self.reasons = state["reasons"]
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float | None:
+        """Seconds left, or None when there is no deadline."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def timeout(self, cap: float | None = None) -> float | None:
+        """Time allowed for the next blocking call: the remaining budget, at most `cap`."""
+        remaining = self.remaining()
+        if remaining is None:
+            return cap
+        if remaining <= 0:
+            raise DeadlineExceeded("Request deadline exceeded")
+        return remaining if cap is None else min(cap, remaining)
+
+    def degrade(self, reason: str) -> None:
+        with self._lock:
+            if reason not in self.reasons:
+                self.reasons.append(reason)
+
+    @property
+    def degraded(self) -> bool:
+        return bool(self.reasons)
+
+
+def inference_timeout(deadline: Deadline | None) -> float | None:
+    """Timeout for one inference call: PRAXIS_INFERENCE_TIMEOUT, tightened by `deadline`."""
+    cap = INFERENCE_TIMEOUT_SECONDS if INFERENCE_TIMEOUT_SECONDS > 0 else None
+    return deadline.timeout(cap) if deadline is not None else cap
+
+
+def model_concurrency(model: str) -> int:
+    """Concurrent calls allowed for `model` (PRAXIS_MODEL_CONCURRENCY)."""
+    return MODEL_CONCURRENCY.get(model, max(1, INFERENCE_WORKERS))
+
+
+def model_executor(model: str) -> concurrent.futures.ThreadPoolExecutor:
+    """
+    The thread pool `model` runs on. Each model has its own, sized by its
+    concurrency limit, so a backlog on one model never holds up another.
+    """
+    with _executors_lock:
+        executor = _executors.get(model)
+        if executor is None:
+            executor = _executors[model] = concurrent.futures.ThreadPoolExecutor(
+                max_workers=model_concurrency(model), thread_name_prefix=f"praxis-{model}"
+            )
+        return executor
+
+
+def run_model(model: str, func, timeout, *args, **kwargs):
+    """
+    Run `func(*args, **kwargs)` on `model`'s pool and return the result.
+    Raises TimeoutError on timeout, including time spent waiting for a free
+    slot. A call that is already running cannot be interrupted; it finishes
+    in the background and its result is dropped.
+    """
+    future = model_executor(model).submit(func, *args, **kwargs)
+    try:
+        return future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        inc(
+            "praxis_inference_timeouts_total",
+            help_text="Inference calls that timed out.",
+            model=model,
+        )
+        raise TimeoutError("Function timed out")
@@ -1,91 +1,153 @@
-import re
-import langcodes
-from langdetect import detect
-from transformers import pipeline
+import logging
 
-_toxicity_pipeline = None
-_text_cache = {}
+from classifier.batching import run_bucketed
+from classifier.cache import TTLCache, inference_key
+from classifier.chunking import chunking_enabled, chunking_signature, run_chunked
+from classifier.deadline import Deadline, inference_timeout, run_model
+from classifier.language_id import identify_languages
+from classifier.model_registry import get_model, get_pipeline
+from classifier.persistent_cache import cache_store, cached_lookup
+from classifier.rule_plan import compile_rules
+from config import INFERENCE_BATCH_SIZE, MODEL_ID
+from metrics import observe_batch, timed
+
+logger = logging.getLogger(__name__)
+
+_text_cache = TTLCache("toxicity")
+
+# Placeholder prediction when toxicity inference times out; the toxicity
+# rule scores it as undecided instead of passing or failing it
+TOXICITY_FALLBACK = {"label": "unknown", "score": None, "fallback": True}
 
 
 def get_toxicity_pipeline():
-    """Lazy load the Hugging Face pipeline only once."""
-    global _toxicity_pipeline
-    if _toxicity_pipeline is None:
-        _toxicity_pipeline = pipeline(
-            "text-classification", model="typeform/distilbert-base-uncased-mnli"
-        )
-    return _toxicity_pipeline
+    """Return the toxicity pipeline, sharing weights via the model registry."""
+    return get_pipeline("text-classification")
 
 
-def evaluate_text(text: str, rules: list[dict]) -> dict:
+def predict_toxicity(
+    texts: list[str],
+    batch_size: int = INFERENCE_BATCH_SIZE,
+    deadline: Deadline | None = None,
+) -> list[dict]:
+    """
+    Run the toxicity model over many texts in length-bucketed batches,
+    skipping texts already in the memory or on-disk cache. With
+    PRAXIS_CHUNK_POOLING set, long texts are scored window by window and the
+    per-label scores pooled before picking the top label.
+    Forward passes are bounded like classify_batch; on timeout the pending
+    texts get TOXICITY_FALLBACK (never cached) and `deadline` is degraded.
+    Returns one {"label", "score"} prediction per text, in input order.
+    """
+    kind = f"toxicity:{chunking_signature()}"
+    keys = [inference_key(kind, text, MODEL_ID) for text in texts]
+    predictions = cached_lookup(_text_cache, keys)
+    pending = [index for index, prediction in enumerate(predictions) if prediction is None]
+
+    if pending:
+
+        def run(batch: list[str]) -> list[dict]:
+            pipe = get_toxicity_pipeline()
+            observe_batch("toxicity", len(batch))
+            with timed("toxicity_inference"):
+                outputs = run_model(
+                    "toxicity", pipe, inference_timeout(deadline), batch, batch_size=batch_size
+                )
+            return [
+                output[0] if isinstance(output, list) else output
+                for output in outputs
+            ]
+
+        def run_all_labels(batch: list[str]) -> list[dict]:
+            pipe = get_toxicity_pipeline()
+            observe_batch("toxicity", len(batch))
+            with timed("toxicity_inference"):
+                outputs = run_model(
+                    "toxicity",
+                    pipe,
+                    inference_timeout(deadline),
+                    batch,
+                    batch_size=batch_size,
+                    top_k=None,
+                )
+            return [{o["label"]: o["score"] for o in output} for output in outputs]
+
+        try:
+            scored = _score_pending(
+                [texts[i] for i in pending], run, run_all_labels, batch_size
+            )
+        except TimeoutError as e:
+            logger.warning("toxicity timed out", extra={"error": str(e)})
+            if deadline is not None:
+                deadline.degrade("toxicity")
+            for index in pending:
+                predictions[index] = dict(TOXICITY_FALLBACK)
+            return predictions
+
+        for index, prediction in zip(pending, scored):
+            predictions[index] = prediction
+        cache_store(_text_cache, {keys[index]: predictions[index] for index in pending})
+
+    return predictions
+
+
+def _score_pending(texts, run, run_all_labels, batch_size) -> list[dict]:
+    if not chunking_enabled():
+        return run_bucketed(run, [text[:512] for text in texts], batch_size)
+
+    _, tokenizer = get_model()
+    pooled = run_chunked(
+        lambda windows: run_bucketed(run_all_labels, windows, batch_size),
+        texts,
+        tokenizer,
+    )
+    scored = []
+    for scores in pooled:
+        label = max(scores, key=scores.get)
+        scored.append({"label": label, "score": scores[label]})
+    return scored
+
+
+def evaluate_text_batch(
+    texts: list[str],
+    rules,
+    batch_size: int = INFERENCE_BATCH_SIZE,
+    deadline: Deadline | None = None,
+) -> list[dict]:
+    """
+    Evaluate many texts against the same rules, given as a rule list or a
+    compiled RulePlan. The rules are compiled once for the whole batch, and
+    toxicity predictions and language IDs for all texts are computed up front.
+    """
+    plan = compile_rules(rules)
+    predictions = [None] * len(texts)
+    if plan.needs_toxicity:
+        predictions = predict_toxicity(texts, batch_size=batch_size, deadline=deadline)
+    languages = [None] * len(texts)
+    if plan.needs_language:
+        with timed("language_id"):
+            languages = identify_languages(texts)
+
+    with timed("rule_evaluation"):
+        return [
+            plan.evaluate(text, toxicity_prediction=prediction, languages=detected)
+            for text, prediction, detected in zip(texts, predictions, languages)
+        ]
+
+
+def evaluate_text(
+    text: str,
+    rules,
+    toxicity_prediction: dict | None = None,
+    deadline: Deadline | None = None,
+) -> dict:
     """
-    Evaluate text against normalized rules.
-    Supports: language, min_length, toxicity.
-    Uses Hugging Face model for toxicity with caching.
+    Evaluate text against normalized rules (or a compiled RulePlan).
+    Supports every rule type in ALLOWED_RULES.
+    Uses Hugging Face model for toxicity with caching, unless a precomputed
+    `toxicity_prediction` is supplied.
     """
-    results = {}
-    total_score = 0.0
-
-    for rule in rules:
-        name = rule["name"]
-        value = rule["value"]
-        weight = rule["weight"]
-
-        passed = False
-        score = 0.0
-
-        if name == "language":
-            try:
-                detected_code = detect(text)
-
-                # Normalize the expected language using langcodes
-                if value in ["English", "French", "Spanish"]:
-                    lang_map = {"English": "en", "French": "fr", "Spanish": "es"}
-                    expected_code = lang_map[value]
-                else:
-                    # Use langcodes to standardize the input
-                    expected_lang = langcodes.find(value)
-                    expected_code = (
-                        str(expected_lang) if expected_lang else value.lower()
-                    )
-
-                passed = detected_code == expected_code
-                score = 1.0 if passed else 0.0
-            except:
-                passed = False
-
-        elif name == "min_length":
-            word_count = len(re.findall(r"\w+", text))
-            passed = word_count >= int(value)
-            score = 1.0 if passed else 0.0
-
-        elif name == "toxicity":
-            cache_key = f"{text[:512]}_{value}"
-            if cache_key in _text_cache:
-                prediction = _text_cache[cache_key]
-            else:
-                pipeline = get_toxicity_pipeline()
-                prediction = pipeline(text[:512])[0]
-                _text_cache[cache_key] = prediction
-
-            label = prediction["label"].lower()
-            toxic_score = prediction["score"]
-
-            if value == "low":
-                passed = label != "toxic" or toxic_score < 0.5
-            elif value == "medium":
-                passed = toxic_score < 0.7
-            elif value == "high":
-                passed = True
-            score = 1.0 if passed else 0.0
-
-            results["toxicity_raw"] = {
-                "label": label,
-                "model_score": round(toxic_score, 3),
-            }
-
-        results[name] = {"passed": passed, "score": score, "weight": weight}
-        total_score += score * weight
-
-    results["weighted_score"] = round(total_score, 2)
-    return results
+    plan = compile_rules(rules)
+    if plan.needs_toxicity and toxicity_prediction is None:
+        toxicity_prediction = predict_toxicity([text], deadline=deadline)[0]
+    return plan.evaluate(text, toxicity_prediction=toxicity_prediction)
@@ -0,0 +1,131 @@
+from collections import deque
+from functools import lru_cache
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed keyword list. Built once, it finds
+    every occurrence of every keyword in a single pass over the text, however
+    many keywords there are.
+
+    - case_sensitive=False folds case on both keywords and text.
+    - whole_words=True only reports matches bounded by non-word characters.
+    Positions are (start, end) offsets into the original text.
+    """
+
+    def __init__(self, keywords, case_sensitive: bool = False, whole_words: bool = True):
+        self.case_sensitive = case_sensitive
+        self.whole_words = whole_words
+        self.keywords = []
+
+        self._goto = [{}]  # state -> {char: next_state}
+        self._fail = [0]
+        self._output = [[]]  # state -> keyword indices ending here
+
+        seen = set()
+        for keyword in keywords:
+            folded = self._fold(keyword)
+            if folded and folded not in seen:
+                seen.add(folded)
+                self._add(folded, len(self.keywords))
+                self.keywords.append(keyword)
+        self._build()
+
+    def _fold(self, text: str) -> str:
+        return text if self.case_sensitive else text.casefold()
+
+    def _add(self, keyword: str, index: int) -> None:
+        state = 0
+        for ch in keyword:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(index)
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = (
+                    self._output[next_state] + self._output[self._fail[next_state]]
+                )
+
+        self._lengths = [len(self._fold(k)) for k in self.keywords]
+
+    def _step(self, state: int, ch: str) -> int:
+        goto, fail = self._goto, self._fail
+        while state and ch not in goto[state]:
+            state = fail[state]
+        return goto[state].get(ch, 0)
+
+    def iter_matches(self, text: str):
+        """Yield (start, end, keyword) for every match, in order of match end."""
+        if not self.keywords:
+            return
+
+        folded = self._fold(text)
+        if len(folded) == len(text):
+            # Common case: folding kept every offset, scan the folded text directly
+            chars = enumerate(folded)
+        else:
+            # Folding changed the length (e.g. "ß" -> "ss"): fold per character
+            # and keep the original offset of every folded character
+            chars = (
+                (position, ch)
+                for position, original in enumerate(text)
+                for ch in self._fold(original)
+            )
+
+        state = 0
+        recent = deque(maxlen=max(self._lengths))  # original offsets of recent chars
+        output, lengths = self._output, self._lengths
+        for position, ch in chars:
+            state = self._step(state, ch)
+            recent.append(position)
+            for index in output[state]:
+                start = recent[-lengths[index]]
+                end = position + 1
+                if self.whole_words and (
+                    (start > 0 and _is_word_char(text[start - 1]))
+                    or (end < len(text) and _is_word_char(text[end]))
+                ):
+                    continue
+                yield start, end, self.keywords[index]
+
+    def search(self, text: str):
+        """First match as (start, end, keyword), or None."""
+        return next(self.iter_matches(text), None)
+
+    def scan(self, text: str, max_positions: int = 20) -> dict:
+        """Total match count, per-keyword counts and the first match positions."""
+        total, counts, positions = 0, {}, []
+        for start, end, keyword in self.iter_matches(text):
+            total += 1
+            counts[keyword] = counts.get(keyword, 0) + 1
+            if len(positions) < max_positions:
+                positions.append([start, end])
+        return {"matches": total, "keywords": counts, "positions": positions}
+
+
+@lru_cache(maxsize=64)
+def build_automaton(
+    keywords: tuple, case_sensitive: bool = False, whole_words: bool = True
+) -> KeywordAutomaton:
+    """Shared automaton per keyword set, so repeated rule sets skip the build."""
+    return KeywordAutomaton(keywords, case_sensitive=case_sensitive, whole_words=whole_words)
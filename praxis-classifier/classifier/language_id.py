@@ -0,0 +1,71 @@
+import threading
+
+from classifier.cache import TTLCache, content_key
+from config import LANGUAGE_SAMPLE_CHARS, LANGUAGE_TOP_K
+
+_language_cache = TTLCache("language_id")
+_factory_lock = threading.Lock()
+_factory_ready = False
+
+
+def _get_factory():
+    """Import langdetect and load its language profiles once."""
+    global _factory_ready
+    from langdetect import DetectorFactory, detector_factory
+
+    with _factory_lock:
+        if not _factory_ready:
+            # A fixed seed makes langdetect's random sampling, and so its answer, repeatable
+            DetectorFactory.seed = 0
+            detector_factory.init_factory()
+            _factory_ready = True
+    return detector_factory._factory
+
+
+def sample_text(text: str, window: int = LANGUAGE_SAMPLE_CHARS) -> str:
+    """
+    Bounded sample of a document: the whole text when short, otherwise equal
+    slices from its start, middle and end.
+    """
+    if len(text) <= window:
+        return text
+    part = window // 3
+    middle = (len(text) - part) // 2
+    return " ".join((text[:part], text[middle : middle + part], text[-part:]))
+
+
+def _identify(sample: str, top_k: int) -> list[dict]:
+    from langdetect.lang_detect_exception import LangDetectException
+
+    factory = _get_factory()
+    try:
+        detector = factory.create()
+        detector.append(sample)
+        probabilities = detector.get_probabilities()
+    except LangDetectException:
+        return []
+    return [
+        {"lang": p.lang, "confidence": round(p.prob, 3)} for p in probabilities[:top_k]
+    ]
+
+
+def identify_languages(texts: list[str], top_k: int = LANGUAGE_TOP_K) -> list[list[dict]]:
+    """
+    Top-k languages with confidences for each text, in input order.
+    Deterministic, bounded per document, and cached by content hash, so
+    repeated documents in a batch are only detected once.
+    """
+    results = []
+    for text in texts:
+        sample = sample_text(text)
+        cache_key = content_key("language_id", sample, top_k)
+        languages = _language_cache.get(cache_key)
+        if languages is None:
+            languages = _identify(sample, top_k)
+            _language_cache.set(cache_key, languages)
+        results.append(languages)
+    return results
+
+
+def identify_language(text: str, top_k: int = LANGUAGE_TOP_K) -> list[dict]:
+    return identify_languages([text], top_k)[0]
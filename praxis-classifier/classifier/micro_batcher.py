@@ -0,0 +1,123 @@
+import concurrent.futures
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from classifier.deadline import Deadline, inference_timeout
+from config import MICROBATCH_ENABLED, MICROBATCH_MAX_SIZE, MICROBATCH_MAX_WAIT_MS
+from metrics import observe_batch
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-text classify calls into batched model calls.
+
+    Callers get a Future immediately. A background thread waits for the first
+    request, keeps collecting for up to `max_wait_ms` or until `max_batch`
+    requests are pending, then runs each group of requests that share the
+    same labels and multi_label flag as one `batch_fn` call.
+    """
+
+    def __init__(
+        self,
+        batch_fn,
+        max_batch: int = MICROBATCH_MAX_SIZE,
+        max_wait_ms: float = MICROBATCH_MAX_WAIT_MS,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="praxis-microbatcher", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, text: str, candidate_labels: list[str], multi_label: bool = True) -> Future:
+        self._ensure_started()
+        future = Future()
+        self._queue.put((text, tuple(candidate_labels), bool(multi_label), future))
+        return future
+
+    def _collect(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            observe_batch("microbatch", len(batch))
+
+            groups = {}
+            for text, labels, multi_label, future in batch:
+                if future.set_running_or_notify_cancel():
+                    groups.setdefault((labels, multi_label), []).append((text, future))
+
+            for (labels, multi_label), items in groups.items():
+                try:
+                    results = self.batch_fn(
+                        [text for text, _ in items], list(labels), multi_label
+                    )
+                except Exception as e:
+                    for _, future in items:
+                        future.set_exception(e)
+                    continue
+                for (_, future), result in zip(items, results):
+                    future.set_result(result)
+
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def get_micro_batcher() -> MicroBatcher:
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            from classifier.ml_classifier import classify_batch
+
+            _batcher = MicroBatcher(classify_batch)
+        return _batcher
+
+
+def classify_text_coalesced(
+    text: str,
+    candidate_labels: list[str],
+    multi_label: bool = True,
+    deadline: Deadline | None = None,
+) -> dict:
+    """
+    classify_text, but batched with other concurrent callers when
+    PRAXIS_MICROBATCH is enabled. Blocks until this text's scores are ready,
+    or until `deadline` runs out, in which case the neutral fallback is
+    returned and the deadline marked degraded.
+    """
+    if not MICROBATCH_ENABLED:
+        from classifier.ml_classifier import classify_text
+
+        return classify_text(text, candidate_labels, multi_label, deadline=deadline)
+
+    future = get_micro_batcher().submit(text, candidate_labels, multi_label)
+    try:
+        return future.result(timeout=inference_timeout(deadline))
+    except (concurrent.futures.TimeoutError, TimeoutError):
+        future.cancel()
+        if deadline is not None:
+            deadline.degrade("zero_shot")
+        return {label: 0.5 for label in candidate_labels}
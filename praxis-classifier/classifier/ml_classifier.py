@@ -1,79 +1,102 @@
-from transformers import pipeline
-import concurrent.futures
-import torch
+import logging
 
+from classifier.batching import run_bucketed
+from classifier.cache import TTLCache, inference_key
+from classifier.chunking import chunking_enabled, chunking_signature, run_chunked
+from classifier.deadline import Deadline, inference_timeout, run_model
+from classifier.model_registry import get_model, get_zero_shot_engine
+from classifier.persistent_cache import cache_store, cached_lookup
+from config import INFERENCE_BATCH_SIZE, MODEL_ID
+from metrics import observe_batch, timed
 
-torch.set_default_device("cpu")
+logger = logging.getLogger(__name__)
 
+_text_cache = TTLCache("zero_shot")
 
-_zero_shot = None
-_text_cache = {}
-_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)  # reused across calls
 
-
-def run_with_timeout(func, timeout, *args, **kwargs):
-    """
-    Run `func(*args, **kwargs)` in a worker thread and return the result.
-    Raises TimeoutError on timeout.
-    """
-    future = _executor.submit(func, *args, **kwargs)
-    try:
-        return future.result(timeout=timeout)
-    except concurrent.futures.TimeoutError:
-        future.cancel()
-        raise TimeoutError("Function timed out")
-
-
-def get_zero_shot_pipeline():
-    """
-    Lazily load and return the zero-shot pipeline. Loading may download model weights
-    the first time it runs.
-    """
-    global _zero_shot
-    if _zero_shot is None:
-        print("🔄 Loading lightweight zero-shot model...")
-        _zero_shot = pipeline(
-            "zero-shot-classification",
-            model="typeform/distilbert-base-uncased-mnli",
-            device=1,
-        )
-    return _zero_shot
+class FallbackScores(dict):
+    """Neutral per-label scores given in place of a failed classification."""
 
 
 def classify_text(
-    text: str, candidate_labels: list[str], multi_label: bool = True
+    text: str,
+    candidate_labels: list[str],
+    multi_label: bool = True,
+    deadline: Deadline | None = None,
 ) -> dict:
     """
-    Zero-shot classifier with timeout protection and caching.
+    Zero-shot classifier with caching.
     Returns a dict: { label: float_score }.
     """
-    cache_key = (text[:200], tuple(candidate_labels), bool(multi_label))
-    if cache_key in _text_cache:
-        return _text_cache[cache_key]
+    return classify_batch(
+        [text], candidate_labels, multi_label=multi_label, deadline=deadline
+    )[0]
 
-    try:
-        pipe = get_zero_shot_pipeline()
-        truncated_text = text[:512]
 
-        # Run the pipeline in a worker thread with timeout.
-        # The HF pipeline is callable: pipe(sequence, candidate_labels, multi_label=...)
-        result = pipe(
-            truncated_text,
-            candidate_labels,
-            multi_label=multi_label,
-        )
+def classify_batch(
+    texts: list[str],
+    candidate_labels: list[str],
+    multi_label: bool = True,
+    batch_size: int = INFERENCE_BATCH_SIZE,
+    deadline: Deadline | None = None,
+) -> list[dict]:
+    """
+    Batched zero-shot classifier. Cached texts (in memory, then on disk) are
+    answered directly, the rest go through the zero-shot engine in
+    length-bucketed batches of `batch_size` documents. With
+    PRAXIS_CHUNK_POOLING set, long texts are scored as overlapping token
+    windows and pooled instead of truncated.
+    Each forward pass is bounded by PRAXIS_INFERENCE_TIMEOUT and `deadline`;
+    on timeout the pending texts get the neutral FallbackScores and the
+    deadline is marked degraded.
+    Returns one { label: float_score } dict per text, in input order.
+    """
+    kind = f"zero_shot:{chunking_signature()}"
+    keys = [
+        inference_key(kind, text, MODEL_ID, tuple(candidate_labels), multi_label)
+        for text in texts
+    ]
+    results = cached_lookup(_text_cache, keys)
+    pending = [index for index, result in enumerate(results) if result is None]
 
-        # result contains keys like "labels" and "scores"
-        scores = {
-            label: round(float(score), 2)
-            for label, score in zip(result["labels"], result["scores"])
-        }
+    if not pending:
+        return results
 
-        # cache and return
-        _text_cache[cache_key] = scores
-        return scores
+    def run(batch: list[str]) -> list[dict]:
+        # every (text, label) pair of the batch runs in one forward pass
+        engine = get_zero_shot_engine()
+        observe_batch("zero_shot", len(batch))
+        with timed("zero_shot_inference"):
+            return run_model(
+                "zero_shot",
+                engine.classify,
+                inference_timeout(deadline),
+                batch,
+                candidate_labels,
+                multi_label=multi_label,
+            )
 
+    try:
+        if chunking_enabled():
+            _, tokenizer = get_model()
+            scored = run_chunked(
+                lambda windows: run_bucketed(run, windows, batch_size),
+                [texts[i] for i in pending],
+                tokenizer,
+            )
+        else:
+            scored = run_bucketed(run, [texts[i][:512] for i in pending], batch_size)
     except Exception as e:
-        print(f"Classification failed or timed out: {e}")
-        # safe fallback: neutral 0.5 per label
-        return {label: 0.5 for label in candidate_labels}
+        logger.warning("classification failed or timed out", extra={"error": str(e)})
+        if deadline is not None:
+            deadline.degrade("zero_shot")
+        # safe fallback: neutral 0.5 per label, never cached
+        for index in pending:
+            results[index] = FallbackScores({label: 0.5 for label in candidate_labels})
+        return results
+
+    for index, scores in zip(pending, scored):
+        results[index] = {label: round(score, 2) for label, score in scores.items()}
+    cache_store(_text_cache, {keys[index]: results[index] for index in pending})
+
+    return results
@@ -0,0 +1,150 @@
+import logging
+import threading
+import time
+
+from classifier.backends import get_backend
+from config import INFERENCE_BACKEND, MODEL_ID
+from metrics import timed
+
+logger = logging.getLogger(__name__)
+
+_models = {}  # model_id -> (model, tokenizer)
+_pipelines = {}  # (task, model_id) -> pipeline sharing the model above
+_engines = {}  # model_id -> ZeroShotEngine sharing the model above
+_stats = {}  # model_id -> load stats
+_lock = threading.Lock()  # guards the dicts above; never held while loading
+_load_locks = {}  # registry entry -> lock held while that one entry is built
+_warmup = {"status": "pending", "started_at": None, "finished_at": None, "error": None}
+_warmup_lock = threading.Lock()
+
+
+def _get_or_build(cache: dict, key, build):
+    """
+    Return cache[key], building it once with `build()`. Only the build of
+    this entry is serialized; readers of other entries and of the stats
+    never wait for a slow load or download.
+    """
+    with _lock:
+        if key in cache:
+            return cache[key]
+        load_lock = _load_locks.setdefault((id(cache), key), threading.Lock())
+    with load_lock:
+        with _lock:
+            if key in cache:
+                return cache[key]
+        value = build()
+        with _lock:
+            cache[key] = value
+        return value
+
+
+def get_model(model_id: str = MODEL_ID):
+    """
+    Return the (model, tokenizer) pair for `model_id`, loading it once per process
+    through the configured inference backend (PRAXIS_BACKEND).
+    Every pipeline built from the registry shares these weights.
+    """
+
+    def load():
+        backend = get_backend(INFERENCE_BACKEND)
+        logger.info("loading model", extra={"model_id": model_id, "backend": backend.name})
+        started = time.perf_counter()
+        with timed("model_load"):
+            model, tokenizer = backend.load(model_id)
+        stats = {
+            "backend": backend.name,
+            "load_seconds": round(time.perf_counter() - started, 3),
+            "memory_bytes": backend.memory_bytes(model),
+            "loaded_at": time.time(),
+        }
+        with _lock:
+            _stats[model_id] = stats
+        return model, tokenizer
+
+    return _get_or_build(_models, model_id, load)
+
+
+def get_pipeline(task: str, model_id: str = MODEL_ID):
+    """Return a CPU pipeline for `task` built on the shared model for `model_id`."""
+
+    def build():
+        from transformers import pipeline
+
+        model, tokenizer = get_model(model_id)
+        return pipeline(task, model=model, tokenizer=tokenizer, device=-1)
+
+    return _get_or_build(_pipelines, (task, model_id), build)
+
+
+def get_zero_shot_engine(model_id: str = MODEL_ID):
+    """Return the premise-reusing zero-shot engine built on the shared model."""
+
+    def build():
+        from classifier.zero_shot import ZeroShotEngine
+
+        model, tokenizer = get_model(model_id)
+        return ZeroShotEngine(model, tokenizer)
+
+    return _get_or_build(_engines, model_id, build)
+
+
+def warmup(
+    tasks: tuple[str, ...] = ("text-classification",),
+    model_id: str = MODEL_ID,
+) -> dict:
+    """
+    Load the model, the zero-shot engine, every pipeline and the language
+    profiles ahead of the first request, and run one probe input through
+    each model so lazily initialized kernels are ready too. Progress is
+    reported by warmup_status().
+    """
+    from classifier.language_id import identify_language
+
+    _set_warmup(status="running", started_at=time.time(), finished_at=None, error=None)
+    try:
+        get_zero_shot_engine(model_id).classify(["warmup"], ["warmup"])
+        for task in tasks:
+            get_pipeline(task, model_id)(["warmup"])
+        identify_language("warmup")
+    except Exception as e:
+        _set_warmup(status="failed", finished_at=time.time(), error=str(e))
+        raise
+    _set_warmup(status="ready", finished_at=time.time())
+    return model_stats()
+
+
+def _set_warmup(**fields) -> None:
+    with _warmup_lock:
+        _warmup.update(fields)
+
+
+def skip_warmup() -> None:
+    """Mark warmup as not needed: models load on first use instead."""
+    _set_warmup(status="skipped", finished_at=time.time())
+
+
+def warmup_status() -> dict:
+    """
+    Warmup progress: "pending", "running", "ready", "failed" or "skipped",
+    with timestamps and the error of a failed warmup. `ready` is True once
+    this worker can serve requests without loading models first.
+    """
+    with _warmup_lock:
+        status = dict(_warmup)
+    status["ready"] = status["status"] in ("ready", "skipped")
+    return status
+
+
+def model_stats() -> dict:
+    """Memory and load-time stats for every loaded model."""
+    with _lock:
+        return {
+            model_id: {
+                **stats,
+                "pipelines": sorted(
+                    task for task, loaded_id in _pipelines if loaded_id == model_id
+                ),
+                "zero_shot_engine": model_id in _engines,
+            }
+            for model_id, stats in _stats.items()
+        }
@@ -0,0 +1,129 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from classifier.cache import TTLCache
+from config import RESULT_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+
+class PersistentCache:
+    """
+    SQLite-backed key/value store for inference results.
+    WAL mode lets every uvicorn worker on the host read and write the same file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, keys: list[str]) -> dict:
+        """Return {key: value} for every key found in the store."""
+        found = {}
+        conn = self._connect()
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT key, value FROM results WHERE key IN ({placeholders})", chunk
+            ).fetchall()
+            found.update((key, json.loads(value)) for key, value in rows)
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, items: dict) -> None:
+        if not items:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO results (key, value, created_at) VALUES (?, ?, ?)",
+                [(key, json.dumps(value), now) for key, value in items.items()],
+            )
+        self.writes += len(items)
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+        }
+
+
+def get_result_cache() -> PersistentCache | None:
+    """Return the shared on-disk result cache, or None when it is not configured."""
+    global _result_cache
+    if not RESULT_CACHE_PATH:
+        return None
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = PersistentCache(RESULT_CACHE_PATH)
+        return _result_cache
+
+
+def cached_lookup(memory: TTLCache, keys: list[str]) -> list:
+    """
+    Look keys up in the in-memory cache, then in the on-disk cache.
+    Disk hits are promoted into memory. Returns one value or None per key.
+    """
+    values = [memory.get(key) for key in keys]
+    missing = [key for key, value in zip(keys, values) if value is None]
+
+    store = get_result_cache()
+    if store is None or not missing:
+        return values
+
+    try:
+        found = store.get_many(missing)
+    except sqlite3.Error as e:
+        logger.warning("result cache read failed", extra={"error": str(e)})
+        return values
+
+    for key, value in found.items():
+        memory.set(key, value)
+    return [found.get(key) if value is None else value for key, value in zip(keys, values)]
+
+
+def cache_store(memory: TTLCache, items: dict) -> None:
+    """Write freshly computed results to the in-memory and on-disk caches."""
+    for key, value in items.items():
+        memory.set(key, value)
+
+    store = get_result_cache()
+    if store is None:
+        return
+    try:
+        store.set_many(items)
+    except sqlite3.Error as e:
+        logger.warning("result cache write failed", extra={"error": str(e)})
@@ -0,0 +1,61 @@
+"""
+Download and prepare every model artifact the service loads, ahead of time.
+
+    python -m classifier.preflight
+    python -m classifier.preflight --cache-dir /opt/praxis/hf-cache
+
+Uses PRAXIS_BACKEND and PRAXIS_MODEL_ID like the service: the model is
+downloaded into the Hugging Face cache, exported to PRAXIS_BACKEND_MODEL_PATH
+for the ONNX backends, and warmed up once. Run it in the image build or an
+init container; serve with HF_HOME pointing at the same cache (and
+HF_HUB_OFFLINE=1 to rule out downloads at startup).
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from config import INFERENCE_BACKEND, MODEL_ID
+
+
+def preflight(model_id: str = MODEL_ID) -> dict:
+    """Fetch, export and warm up `model_id`; returns what was prepared."""
+    from classifier.backends import get_backend
+    from classifier.model_registry import warmup, warmup_status
+
+    backend = get_backend(INFERENCE_BACKEND)
+    stats = warmup(model_id=model_id)
+    return {
+        "backend": backend.name,
+        "model": model_id,
+        "artifacts": None if backend.name == "torch" else backend.default_path(model_id),
+        "hf_home": os.getenv("HF_HOME"),
+        "warmup": warmup_status(),
+        "models": stats,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Pre-download and warm up model artifacts.")
+    parser.add_argument("--model", default=MODEL_ID)
+    parser.add_argument(
+        "--cache-dir", default=None, help="Hugging Face cache to fill (sets HF_HOME)"
+    )
+    args = parser.parse_args(argv)
+
+    # must be set before transformers is first imported
+    if args.cache_dir:
+        os.environ["HF_HOME"] = os.path.abspath(args.cache_dir)
+
+    try:
+        result = preflight(args.model)
+    except Exception as e:
+        print(f"Preflight failed: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(result, indent=2, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+import langcodes
+
+from classifier.keyword_automaton import KeywordAutomaton, build_automaton
+from classifier.language_id import identify_language
+
+WORD_PATTERN = re.compile(r"\w+")
+
+# Score of a rule that could not be decided (passed is None), e.g. toxicity
+# when inference timed out
+UNDECIDED_SCORE = 0.5
+LANG_MAP = {"English": "en", "French": "fr", "Spanish": "es"}
+
+
+@lru_cache(maxsize=256)
+def resolve_language_code(value: str) -> str:
+    """Normalize a language name ("English", "german", "pt-BR") to a code."""
+    if value in LANG_MAP:
+        return LANG_MAP[value]
+    try:
+        # Use langcodes to standardize the input
+        expected_lang = langcodes.find(value)
+        return str(expected_lang) if expected_lang else value.lower()
+    except LookupError:
+        return value.lower()
+
+
+class Document:
+    """A text plus the per-document facts checkers share, computed at most once."""
+
+    def __init__(
+        self,
+        text: str,
+        toxicity_prediction: dict | None = None,
+        languages: list[dict] | None = None,
+    ):
+        self.text = text
+        self.toxicity_prediction = toxicity_prediction
+        self.languages = languages
+        self._word_count = None
+
+    @property
+    def word_count(self) -> int:
+        if self._word_count is None:
+            self._word_count = len(WORD_PATTERN.findall(self.text))
+        return self._word_count
+
+    @property
+    def language(self) -> str | None:
+        """Most likely language code, or None when detection fails."""
+        if self.languages is None:
+            self.languages = identify_language(self.text)
+        return self.languages[0]["lang"] if self.languages else None
+
+
+@dataclass(frozen=True)
+class LanguageChecker:
+    name: str
+    weight: float
+    expected_code: str
+
+    def check(self, doc: Document) -> tuple[bool, dict | None]:
+        passed = doc.language is not None and doc.language == self.expected_code
+        return passed, {"detected": doc.languages}
+
+
+@dataclass(frozen=True)
+class ExcludedLanguageChecker:
+    name: str
+    weight: float
+    excluded_code: str
+
+    def check(self, doc: Document) -> tuple[bool, dict | None]:
+        passed = doc.language is not None and doc.language != self.excluded_code
+        return passed, {"detected": doc.languages}
+
+
+@dataclass(frozen=True)
+class MinLengthChecker:
+    name: str
+    weight: float
+    min_words: int
+
+    def check(self, doc: Document) -> tuple[bool, dict | None]:
+        return doc.word_count >= self.min_words, None
+
+
+@dataclass(frozen=True)
+class MaxLengthChecker:
+    name: str
+    weight: float
+    max_words: int
+
+    def check(self, doc: Document) -> tuple[bool, dict | None]:
+        return doc.word_count <= self.max_words, None
+
+
+@dataclass(frozen=True)
+class ToxicityChecker:
+    name: str
+    weight: float
+    level: str
+
+    def check(self, doc: Document) -> tuple[bool | None, dict | None]:
+        """Undecided (None) when the prediction is a timeout fallback."""
+        prediction = doc.toxicity_prediction
+        if prediction.get("fallback"):
+            return None, {"label": prediction["label"], "model_score": None, "fallback": True}
+        label = prediction["label"].lower()
+        toxic_score = prediction["score"]
+
+        passed = False
+        if self.level == "low":
+            passed = label != "toxic" or toxic_score < 0.5
+        elif self.level == "medium":
+            passed = toxic_score < 0.7
+        elif self.level == "high":
+            passed = True
+        return passed, {"label": label, "model_score": round(toxic_score, 3)}
+
+
+@dataclass(frozen=True)
+class ProhibitedKeywordsChecker:
+    """Passes when none of the keywords occur; reports match counts and positions."""
+
+    name: str
+    weight: float
+    automaton: KeywordAutomaton
+
+    def check(self, doc: Document) -> tuple[bool, dict | None]:
+        scan = self.automaton.scan(doc.text)
+        return scan["matches"] == 0, scan
+
+
+@dataclass(frozen=True)
+class UnknownRuleChecker:
+    """Rules with no evaluator never pass, as before."""
+
+    name: str
+    weight: float
+
+    def check(self, doc: Document) -> tuple[bool, dict | None]:
+        return False, None
+
+
+def _compile_rule(rule: dict):
+    name, value, weight = rule["name"], rule["value"], rule["weight"]
+
+    if name == "language":
+        return LanguageChecker(name, weight, resolve_language_code(str(value)))
+    if name == "excluded_language":
+        return ExcludedLanguageChecker(name, weight, resolve_language_code(str(value)))
+    if name == "min_length":
+        return MinLengthChecker(name, weight, int(value))
+    if name == "max_length":
+        return MaxLengthChecker(name, weight, int(value))
+    if name == "toxicity":
+        return ToxicityChecker(name, weight, str(value))
+    if name == "prohibited_keywords":
+        # value is a keyword list, or {"keywords": [...], "case_sensitive": bool,
+        # "whole_words": bool} to change the matching mode
+        options = value if isinstance(value, dict) else {"keywords": value}
+        keywords = options.get("keywords") or []
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        automaton = build_automaton(
+            tuple(str(k) for k in keywords),
+            case_sensitive=bool(options.get("case_sensitive", False)),
+            whole_words=bool(options.get("whole_words", True)),
+        )
+        return ProhibitedKeywordsChecker(name, weight, automaton)
+    return UnknownRuleChecker(name, weight)
+
+
+@dataclass(frozen=True)
+class RulePlan:
+    """
+    An immutable, precompiled rule set. Build it once per request with
+    compile_rules() and apply it to every document.
+    """
+
+    checkers: tuple
+
+    @property
+    def needs_toxicity(self) -> bool:
+        return any(isinstance(c, ToxicityChecker) for c in self.checkers)
+
+    @property
+    def needs_language(self) -> bool:
+        return any(
+            isinstance(c, (LanguageChecker, ExcludedLanguageChecker))
+            for c in self.checkers
+        )
+
+    def evaluate(
+        self,
+        text: str,
+        toxicity_prediction: dict | None = None,
+        languages: list[dict] | None = None,
+    ) -> dict:
+        doc = Document(text, toxicity_prediction, languages)
+        results = {}
+        total_score = 0.0
+
+        for checker in self.checkers:
+            passed, raw = checker.check(doc)
+            score = UNDECIDED_SCORE if passed is None else 1.0 if passed else 0.0
+
+            if raw is not None:
+                results[f"{checker.name}_raw"] = raw
+
+            results[checker.name] = {
+                "passed": passed,
+                "score": score,
+                "weight": checker.weight,
+            }
+            total_score += score * checker.weight
+
+        results["weighted_score"] = round(total_score, 2)
+        return results
+
+
+def compile_rules(rules) -> RulePlan:
+    """Compile a normalized rule list into a RulePlan; plans pass through unchanged."""
+    if isinstance(rules, RulePlan):
+        return rules
+    return RulePlan(tuple(_compile_rule(rule) for rule in rules))
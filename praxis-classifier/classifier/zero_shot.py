@@ -0,0 +1,102 @@
+import threading
+
+import torch
+
+
+class ZeroShotEngine:
+    """
+    NLI zero-shot classifier that avoids the per-label cost of the HF pipeline.
+
+    Each premise is tokenized once and each label's hypothesis once (cached),
+    then every (premise, hypothesis) pair for a batch of documents is built
+    from token ids and run as a single padded forward pass.
+    """
+
+    def __init__(
+        self,
+        model,
+        tokenizer,
+        hypothesis_template: str = "This example is {}.",
+        max_length: int = 512,
+    ):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.hypothesis_template = hypothesis_template
+        self.max_length = min(max_length, tokenizer.model_max_length or max_length)
+        self.entailment_id, self.contradiction_id = self._nli_label_ids(model.config)
+        self.uses_token_types = "token_type_ids" in tokenizer.model_input_names
+
+        self._hypotheses = {}  # label -> hypothesis token ids
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _nli_label_ids(config) -> tuple[int, int]:
+        entailment, contradiction = None, None
+        for label, index in config.label2id.items():
+            if label.lower().startswith("entail"):
+                entailment = index
+            elif label.lower().startswith("contra"):
+                contradiction = index
+        if entailment is None or contradiction is None:
+            raise ValueError("Model config has no entailment/contradiction labels")
+        return entailment, contradiction
+
+    def hypothesis_ids(self, label: str) -> list[int]:
+        with self._lock:
+            ids = self._hypotheses.get(label)
+            if ids is None:
+                ids = self.tokenizer(
+                    self.hypothesis_template.format(label), add_special_tokens=False
+                )["input_ids"]
+                self._hypotheses[label] = ids
+            return ids
+
+    def _pair(self, premise: list[int], hypothesis: list[int]) -> dict:
+        room = self.max_length - len(hypothesis) - self.tokenizer.num_special_tokens_to_add(
+            pair=True
+        )
+        premise = premise[: max(0, room)]
+        features = {
+            "input_ids": self.tokenizer.build_inputs_with_special_tokens(premise, hypothesis)
+        }
+        if self.uses_token_types:
+            features["token_type_ids"] = self.tokenizer.create_token_type_ids_from_sequences(
+                premise, hypothesis
+            )
+        return features
+
+    def classify(
+        self, texts: list[str], candidate_labels: list[str], multi_label: bool = True
+    ) -> list[dict]:
+        """Return one {label: score} dict per text, scored in one forward pass."""
+        if not texts or not candidate_labels:
+            return [{} for _ in texts]
+
+        premises = self.tokenizer(
+            texts, add_special_tokens=False, truncation=True, max_length=self.max_length
+        )["input_ids"]
+        hypotheses = [self.hypothesis_ids(label) for label in candidate_labels]
+
+        features = [
+            self._pair(premise, hypothesis)
+            for premise in premises
+            for hypothesis in hypotheses
+        ]
+        inputs = self.tokenizer.pad(features, return_tensors="pt")
+
+        with torch.inference_mode():
+            logits = self.model(**inputs).logits
+        logits = logits.reshape(len(texts), len(candidate_labels), -1)
+
+        if multi_label:
+            # Each label independently: entailment vs contradiction
+            pair = logits[..., [self.contradiction_id, self.entailment_id]]
+            scores = pair.softmax(dim=-1)[..., 1]
+        else:
+            # Labels compete: softmax over the entailment logits
+            scores = logits[..., self.entailment_id].softmax(dim=-1)
+
+        return [
+            {label: float(score) for label, score in zip(candidate_labels, row)}
+            for row in scores.tolist()
+        ]
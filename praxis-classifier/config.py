@@ -0,0 +1,148 @@
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_limits(name: str, default: str) -> dict[str, int]:
+    """Parse "key=int,key=int"; malformed entries are ignored."""
+    limits = {}
+    for entry in os.getenv(name, default).split(","):
+        key, _, value = entry.partition("=")
+        try:
+            limits[key.strip().lower()] = max(1, int(value))
+        except ValueError:
+            continue
+    return limits
+
+
+# Number of documents sent through the model in a single forward pass.
+INFERENCE_BATCH_SIZE = _env_int("PRAXIS_INFERENCE_BATCH_SIZE", 16)
+
+# Hugging Face model shared by the zero-shot and toxicity stages.
+MODEL_ID = os.getenv("PRAXIS_MODEL_ID", "typeform/distilbert-base-uncased-mnli")
+
+# Load model weights at startup instead of on the first request.
+WARMUP_ON_STARTUP = os.getenv("PRAXIS_WARMUP", "1") not in ("0", "false", "False")
+
+# In-memory inference caches: maximum entries and time to live (0 disables expiry).
+CACHE_MAX_ENTRIES = _env_int("PRAXIS_CACHE_MAX_ENTRIES", 10000)
+CACHE_TTL_SECONDS = _env_int("PRAXIS_CACHE_TTL_SECONDS", 3600)
+
+# Optional SQLite file for inference results shared across workers and restarts.
+RESULT_CACHE_PATH = os.getenv("PRAXIS_RESULT_CACHE_PATH", "")
+
+# Streaming ZIP ingestion: bytes read per chunk, the most text kept per member,
+# and how many members are decoded and scored together.
+READ_CHUNK_BYTES = _env_int("PRAXIS_READ_CHUNK_BYTES", 1024 * 1024)
+MAX_MEMBER_BYTES = _env_int("PRAXIS_MAX_MEMBER_BYTES", 8 * 1024 * 1024)
+STREAM_GROUP_FILES = _env_int("PRAXIS_STREAM_GROUP_FILES", 64)
+
+# Process-pool mode for large archives: worker processes (0 keeps scoring
+# in-process), torch threads per worker, and the smallest archive worth sharding.
+POOL_WORKERS = _env_int("PRAXIS_WORKERS", 0)
+TORCH_THREADS = _env_int(
+    "PRAXIS_TORCH_THREADS", max(1, (os.cpu_count() or 1) // max(1, POOL_WORKERS))
+)
+PARALLEL_MIN_FILES = _env_int("PRAXIS_PARALLEL_MIN_FILES", 256)
+
+# Async evaluation jobs: background worker threads and an optional SQLite file
+# for job state (empty keeps jobs in memory).
+JOB_WORKERS = _env_int("PRAXIS_JOB_WORKERS", 1)
+JOB_STORE_PATH = os.getenv("PRAXIS_JOB_STORE_PATH", "")
+
+# Finished in-memory jobs are forgotten after JOB_TTL_SECONDS (0 keeps them) or
+# once more than JOB_MAX_FINISHED have piled up, oldest first.
+JOB_TTL_SECONDS = _env_int("PRAXIS_JOB_TTL_SECONDS", 3600)
+JOB_MAX_FINISHED = _env_int("PRAXIS_JOB_MAX_FINISHED", 1000)
+
+# Workers refresh a heartbeat on their SQLite job rows; queued or running rows
+# without one for JOB_STALE_SECONDS belonged to a worker that died and are failed.
+JOB_STALE_SECONDS = _env_int("PRAXIS_JOB_STALE_SECONDS", 60)
+
+# Try the offline regex extractor before calling Gemini for description rules.
+LOCAL_RULE_EXTRACTION = os.getenv("PRAXIS_LOCAL_RULES", "1") not in ("0", "false", "False")
+
+# Language identification: characters sampled per document and languages reported.
+LANGUAGE_SAMPLE_CHARS = _env_int("PRAXIS_LANGUAGE_SAMPLE_CHARS", 2000)
+LANGUAGE_TOP_K = _env_int("PRAXIS_LANGUAGE_TOP_K", 3)
+
+# Sliding-window inference for long documents. CHUNK_POOLING is "off" (score the
+# first 512 characters only), "max", "mean" or "attention".
+CHUNK_POOLING = os.getenv("PRAXIS_CHUNK_POOLING", "off").lower()
+CHUNK_WINDOW_TOKENS = _env_int("PRAXIS_CHUNK_WINDOW_TOKENS", 384)
+CHUNK_OVERLAP_TOKENS = _env_int("PRAXIS_CHUNK_OVERLAP_TOKENS", 64)
+CHUNK_MAX_WINDOWS = _env_int("PRAXIS_CHUNK_MAX_WINDOWS", 8)
+
+# Inference backend behind classify_text and toxicity: "torch", "onnx" or
+# "onnx-int8". ONNX backends load from a "<model--id>-<backend>" subdirectory of
+# BACKEND_MODEL_PATH (default "models") when it holds their export, and export
+# there on first use otherwise.
+INFERENCE_BACKEND = os.getenv("PRAXIS_BACKEND", "torch").lower()
+BACKEND_MODEL_PATH = os.getenv("PRAXIS_BACKEND_MODEL_PATH", "")
+
+# Micro-batching for /api/description: concurrent classify calls are collected
+# for up to MICROBATCH_MAX_WAIT_MS or MICROBATCH_MAX_SIZE items and run together.
+MICROBATCH_ENABLED = os.getenv("PRAXIS_MICROBATCH", "1") not in ("0", "false", "False")
+MICROBATCH_MAX_WAIT_MS = _env_int("PRAXIS_MICROBATCH_MAX_WAIT_MS", 5)
+MICROBATCH_MAX_SIZE = _env_int("PRAXIS_MICROBATCH_MAX_SIZE", 32)
+
+# Deadlines: total time budget per request (0 disables), the longest a single
+# inference call may block, and the threads inference calls run on.
+REQUEST_TIMEOUT_SECONDS = _env_int("PRAXIS_REQUEST_TIMEOUT", 120)
+INFERENCE_TIMEOUT_SECONDS = _env_int("PRAXIS_INFERENCE_TIMEOUT", 30)
+INFERENCE_WORKERS = _env_int("PRAXIS_INFERENCE_WORKERS", 2)
+
+# Incremental re-evaluation: SQLite file of per-member fingerprints and scores
+# for datasets submitted with a dataset_id (empty disables it).
+FINGERPRINT_STORE_PATH = os.getenv("PRAXIS_FINGERPRINT_PATH", "")
+
+# Structured members (.csv, .json, .jsonl): read record by record instead of
+# as one text, the fields tried in order for each record's text, and how many
+# records per file are sampled and scored.
+STRUCTURED_READERS = os.getenv("PRAXIS_STRUCTURED", "1") not in ("0", "false", "False")
+STRUCTURED_TEXT_FIELDS = tuple(
+    field.strip().lower()
+    for field in os.getenv(
+        "PRAXIS_TEXT_FIELDS", "text,content,body,review,comment,description,message"
+    ).split(",")
+    if field.strip()
+)
+STRUCTURED_MAX_RECORDS = _env_int("PRAXIS_MAX_RECORDS_PER_FILE", 200)
+
+# Sampling mode for /api/classify?sample=true: members are scored in stratified
+# rounds of SAMPLE_ROUND_FILES until the CONFIDENCE interval of dataset_score
+# is within +/- TARGET_MARGIN.
+SAMPLE_TARGET_MARGIN = _env_float("PRAXIS_SAMPLE_MARGIN", 0.02)
+SAMPLE_CONFIDENCE = _env_float("PRAXIS_SAMPLE_CONFIDENCE", 0.95)
+SAMPLE_ROUND_FILES = _env_int("PRAXIS_SAMPLE_ROUND_FILES", 64)
+
+# Duplicate collapsing before inference: "exact" scores one member per content
+# hash, "near" also clusters near-duplicates by MinHash/LSH, "off" scores every
+# member. Near-duplicates need an estimated Jaccard similarity of NEAR_DUP_THRESHOLD.
+# "near" costs about 5 ms of CPU per 20 KB member with 64 permutations (shingling
+# plus the signature, which grows with both), on top of the SHA-256 of "exact".
+DEDUP_MODE = os.getenv("PRAXIS_DEDUP", "exact").lower()
+NEAR_DUP_THRESHOLD = _env_float("PRAXIS_NEAR_DUP_THRESHOLD", 0.85)
+MINHASH_PERMUTATIONS = _env_int("PRAXIS_MINHASH_PERMUTATIONS", 64)
+LSH_BANDS = _env_int("PRAXIS_LSH_BANDS", 16)
+
+# Async routes: threads running blocking pipeline work, and how many more
+# requests may wait for one before new requests are turned away with a 429.
+PIPELINE_WORKERS = _env_int("PRAXIS_PIPELINE_WORKERS", 4)
+PIPELINE_QUEUE = _env_int("PRAXIS_PIPELINE_QUEUE", 8)
+
+# Concurrent calls allowed per model, e.g. "zero_shot=2,toxicity=2,gemini=8";
+# models not listed get INFERENCE_WORKERS.
+MODEL_CONCURRENCY = _env_limits("PRAXIS_MODEL_CONCURRENCY", "gemini=8")
@@ -1,9 +1,62 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from routes.classify_routes import router as classify_router
 from routes.evaluate_routes import router as evaluate_router
+from routes.job_routes import router as job_router
+from routes.metrics_routes import router as metrics_router
+from routes.system_routes import router as system_router
 from fastapi.middleware.cors import CORSMiddleware
+from classifier.model_registry import skip_warmup, warmup
+from rules.gemini_client import close_async_client
+from services.executor import PipelineSaturated
+from services.jobs import shutdown_job_manager
+from services.worker_pool import shutdown_worker_pool
+from config import WARMUP_ON_STARTUP
+from logging_config import configure_logging
+
+configure_logging()
+logger = logging.getLogger(__name__)
+
+
+async def _warmup_in_background():
+    try:
+        await asyncio.to_thread(warmup)
+    except Exception:
+        logger.exception("model warmup failed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the shared model once per worker without holding up startup;
+    # /api/ready reports 503 until it is done
+    warming = None
+    if WARMUP_ON_STARTUP:
+        warming = asyncio.create_task(_warmup_in_background())
+    else:
+        skip_warmup()
+    yield
+    if warming is not None:
+        warming.cancel()
+    await close_async_client()
+    await asyncio.to_thread(shutdown_job_manager)
+    await asyncio.to_thread(shutdown_worker_pool)
+
+
+app = FastAPI(title="Praxis Classifier API", lifespan=lifespan)
+
+
+@app.exception_handler(PipelineSaturated)
+async def pipeline_saturated_handler(request: Request, exc: PipelineSaturated):
+    # Backpressure: tell clients to retry instead of queueing without bound
+    return JSONResponse(
+        {"detail": "Server is at capacity, retry shortly."},
+        status_code=429,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
-app = FastAPI(title="Praxis Classifier API")
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,6 +67,9 @@ app.add_middleware(
 
 app.include_router(classify_router, prefix="/api", tags=["Classification"])
 app.include_router(evaluate_router, prefix="/api", tags=["Evaluation"])
+app.include_router(job_router, prefix="/api", tags=["Jobs"])
+app.include_router(system_router, prefix="/api", tags=["System"])
+app.include_router(metrics_router, tags=["System"])
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,170 @@
+import bisect
+import functools
+import threading
+import time
+
+# Seconds; covers sub-millisecond cache hits up to multi-minute archives
+LATENCY_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0
+)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+_lock = threading.Lock()
+_histograms = {}  # name -> Histogram
+_counters = {}  # (name, labels) -> value
+_help = {}  # name -> help text
+_collectors = []  # callables returning extra samples at scrape time
+
+
+class Histogram:
+    """Prometheus-style cumulative histogram, one series per label set."""
+
+    def __init__(self, name: str, help_text: str, buckets: tuple):
+        self.name = name
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [bucket counts..., sum, count]
+        _help[name] = help_text
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        with _lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def samples(self) -> list[str]:
+        lines = []
+        with _lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+        for key, series in sorted(items):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{_labels(key, le=_fmt(bound))} {cumulative}"
+                )
+            lines.append(f"{self.name}_bucket{_labels(key, le='+Inf')} {series[-1]}")
+            lines.append(f"{self.name}_sum{_labels(key)} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{_labels(key)} {series[-1]}")
+        return lines
+
+
+def _fmt(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _labels(key: tuple, **extra) -> str:
+    pairs = list(key) + list(extra.items())
+    if not pairs:
+        return ""
+    body = ",".join(f'{k}="{str(v).replace(chr(34), chr(39))}"' for k, v in pairs)
+    return "{" + body + "}"
+
+
+def histogram(name: str, help_text: str, buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+    with _lock:
+        if name not in _histograms:
+            _histograms[name] = Histogram(name, help_text, buckets)
+        return _histograms[name]
+
+
+STAGE_SECONDS = histogram("praxis_stage_seconds", "Latency of each pipeline stage.")
+BATCH_SIZE = histogram(
+    "praxis_batch_size", "Items per model batch, by stage.", SIZE_BUCKETS
+)
+
+
+def inc(name: str, amount: float = 1, help_text: str = "", **labels) -> None:
+    """Increment a counter."""
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+        if help_text:
+            _help.setdefault(name, help_text)
+
+
+def observe_batch(stage: str, size: int) -> None:
+    BATCH_SIZE.observe(size, stage=stage)
+
+
+class timed:
+    """
+    Record the duration of a stage in praxis_stage_seconds. Works as a
+    context manager (`with timed("zip_decode"):`) or a decorator (`@timed("x")`).
+    """
+
+    __slots__ = ("stage", "_started")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._started = 0.0
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        STAGE_SECONDS.observe(time.perf_counter() - self._started, stage=self.stage)
+        if exc_type is not None:
+            inc("praxis_stage_errors_total", help_text="Stage failures.", stage=self.stage)
+        return False
+
+    def __call__(self, func):
+        stage = self.stage
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+def register_collector(collector) -> None:
+    """
+    Register a callable returning [(name, type, help, labels_dict, value), ...],
+    evaluated on every scrape (used for cache counters and similar state).
+    """
+    with _lock:
+        _collectors.append(collector)
+
+
+def render_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        histograms = list(_histograms.values())
+        counters = sorted(_counters.items())
+        collectors = list(_collectors)
+
+    for hist in histograms:
+        lines.append(f"# HELP {hist.name} {_help.get(hist.name, '')}")
+        lines.append(f"# TYPE {hist.name} histogram")
+        lines.extend(hist.samples())
+
+    seen = set()
+    for (name, key), value in counters:
+        if name not in seen:
+            seen.add(name)
+            lines.append(f"# HELP {name} {_help.get(name, '')}")
+            lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name}{_labels(key)} {value}")
+
+    # Group collector samples by metric name; the format wants each family contiguous
+    families = {}
+    for collector in collectors:
+        for name, kind, help_text, labels, value in collector():
+            family = families.setdefault(name, (kind, help_text, []))
+            family[2].append(f"{name}{_labels(tuple(sorted(labels.items())))} {value}")
+    for name, (kind, help_text, samples) in families.items():
+        if name not in seen:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+        lines.extend(samples)
+
+    return "\n".join(lines) + "\n"
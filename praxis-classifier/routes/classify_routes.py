@@ -1,9 +1,22 @@
-from fastapi import APIRouter, UploadFile, File
-from services.process_routes import evaluate_description
-from services.process_routes import evaluate_files
+import json
+import logging
+import os
+from fastapi import APIRouter, UploadFile, File, Form, Query
+from fastapi.responses import StreamingResponse
+from services.executor import PipelineSlot, iterate_in_pipeline, release_slot, reserve_slot
+from services.process_routes import (
+    evaluate_description_async,
+    evaluate_files,
+    files_fallback,
+    iter_file_results,
+    request_deadline,
+    run_until_deadline,
+)
+from services.uploads import spool_upload, spooled_upload
 from pydantic import BaseModel
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 class DescriptionInput(BaseModel):
@@ -11,11 +24,70 @@ class DescriptionInput(BaseModel):
 
 
 @router.post("/classify")
-async def classify_zip_route(file: UploadFile = File(...)):
-    file_bytes = await file.read()
-    return evaluate_files(file_bytes)
+async def classify_zip_route(
+    file: UploadFile = File(...),
+    dataset_id: str | None = Form(None),
+    stream: bool = False,
+    sample: bool = False,
+    margin: float | None = Query(None, gt=0, le=1),
+):
+    # ?stream=true sends NDJSON records as files are scored; ?sample=true
+    # estimates the score from a stratified sample to within ±margin; with a
+    # dataset_id, members unchanged since the last upload are not rescored.
+    # Scoring runs on the bounded pipeline threads; when they are all taken
+    # the request gets a 429 instead of waiting.
+    if stream:
+        reserve_slot()
+        try:
+            zip_path = await spool_upload(file)
+        except Exception:
+            release_slot()
+            raise
+        return StreamingResponse(
+            iterate_in_pipeline(_ndjson_results(zip_path, dataset_id)),
+            media_type="application/x-ndjson",
+        )
+
+    slot = PipelineSlot()
+    try:
+        async with spooled_upload(file) as zip_path:
+            return await run_until_deadline(
+                evaluate_files,
+                zip_path,
+                deadline=request_deadline(),
+                dataset_id=dataset_id,
+                sample=sample,
+                margin=margin,
+                fallback=files_fallback,
+                slot=slot,
+            )
+    finally:
+        slot.release()
+
+
+def _ndjson_results(zip_path: str, dataset_id: str | None):
+    """
+    One JSON line per scored file, then the summary line. Each line is
+    pulled on a pipeline thread; the spooled file is removed when the
+    generator finishes or the client goes away.
+    """
+    try:
+        for record in iter_file_results(
+            zip_path, deadline=request_deadline(), dataset_id=dataset_id
+        ):
+            yield json.dumps(record, default=str) + "\n"
+    except Exception as e:
+        logger.exception("streaming evaluation failed")
+        yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+    finally:
+        try:
+            os.unlink(zip_path)
+        except OSError:
+            pass
 
 
 @router.post("/description")
 async def description_route(data: DescriptionInput):
-    return evaluate_description(data)
+    # Gemini is awaited on the event loop and scoring runs on the pipeline
+    # threads, so concurrent requests can be micro-batched together
+    return await evaluate_description_async(data.description, request_deadline())
@@ -1,45 +1,69 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from services.executor import PipelineSaturated, PipelineSlot
 from services.process_routes import (
-    evaluate_description,
+    evaluate_description_async,
     evaluate_files,
+    files_fallback,
     combine_results,
+    request_deadline,
+    run_until_deadline,
 )
+from services.uploads import spooled_upload
 from starlette.responses import JSONResponse
 import asyncio
-import traceback
+import logging
+import os
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 @router.post("/evaluate")
-async def evaluate(description: str = Form(...), files: UploadFile = File(...)):
+async def evaluate(
+    description: str = Form(...),
+    files: UploadFile = File(...),
+    dataset_id: str | None = Form(None),
+):
     """
     Handles concurrent evaluation of both description and ZIP dataset,
     then fuses results into a unified response with robust error handling.
     """
-    print("/evaluate route has been hit")
+    logger.info("/evaluate route has been hit")
 
+    # the file evaluation's pipeline slot is claimed before the upload is
+    # spooled, so a saturated pipeline answers 429 without writing it to disk
+    slot = PipelineSlot()
     try:
-        # Read file safely
-        try:
-            file_bytes = await files.read()
-            if not file_bytes:
-                raise ValueError("Uploaded file is empty or unreadable.")
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"File read error: {e}")
+        async with spooled_upload(files) as zip_path:
+            # Check the spooled file safely
+            try:
+                if os.path.getsize(zip_path) == 0:
+                    raise ValueError("Uploaded file is empty or unreadable.")
+            except Exception as e:
+                raise HTTPException(status_code=400, detail=f"File read error: {e}")
 
-        # Run description and file evaluations concurrently
-        desc_task = asyncio.to_thread(evaluate_description, description)
-        file_task = asyncio.to_thread(evaluate_files, file_bytes)
-
-        try:
-            desc_result, file_result = await asyncio.gather(desc_task, file_task)
-        except Exception as e:
-            traceback.print_exc()
-            raise HTTPException(
-                status_code=500, detail=f"Error in evaluation tasks: {str(e)}"
+            # Run description and file evaluations concurrently, each with the
+            # request's time budget
+            desc_task = evaluate_description_async(description, request_deadline())
+            file_task = run_until_deadline(
+                evaluate_files,
+                zip_path,
+                deadline=request_deadline(),
+                dataset_id=dataset_id,
+                fallback=files_fallback,
+                slot=slot,
             )
 
+            try:
+                desc_result, file_result = await asyncio.gather(desc_task, file_task)
+            except PipelineSaturated:
+                raise
+            except Exception as e:
+                logger.exception("evaluation tasks failed")
+                raise HTTPException(
+                    status_code=500, detail=f"Error in evaluation tasks: {str(e)}"
+                )
+
         # Ensure results are valid dicts
         if not isinstance(desc_result, dict):
             raise TypeError(
@@ -52,17 +76,20 @@ async def evaluate(description: str = Form(...), files: UploadFile = File(...)):
         try:
             final_output = combine_results(desc_result, file_result)
         except Exception as e:
-            traceback.print_exc()
+            logger.exception("result fusion failed")
             raise HTTPException(status_code=500, detail=f"Fusion error: {str(e)}")
         return JSONResponse(final_output)
 
-    except HTTPException as e:
-        # Pass-through FastAPI-style errors
+    except (HTTPException, PipelineSaturated) as e:
+        # Pass-through FastAPI-style errors and backpressure (answered with 429)
         raise e
 
     except Exception as e:
         # Fallback for unexpected issues
-        traceback.print_exc()
+        logger.exception("unexpected error in /evaluate")
         raise HTTPException(
             status_code=500, detail=f"Unexpected server error: {str(e)}"
         )
+
+    finally:
+        slot.release()
@@ -0,0 +1,59 @@
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from services.jobs import SUCCEEDED, FINISHED_STATES, get_job_manager
+from services.uploads import spool_upload
+
+router = APIRouter()
+
+
+def _public(job: dict) -> dict:
+    """Job status without the (possibly large) result payload."""
+    return {key: value for key, value in job.items() if key != "result"}
+
+
+@router.post("/jobs", status_code=202)
+async def submit_job(
+    description: str = Form(...),
+    files: UploadFile = File(...),
+    dataset_id: str | None = Form(None),
+):
+    """Queue a description + ZIP evaluation and return its job id immediately."""
+    try:
+        zip_path = await spool_upload(files)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"File read error: {e}")
+
+    job = get_job_manager().submit(description, zip_path, dataset_id=dataset_id)
+    return _public(job)
+
+
+@router.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    """Status and progress (files done / total) of a job."""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _public(job)
+
+
+@router.get("/jobs/{job_id}/result")
+async def job_result(job_id: str):
+    """Result of a finished job; 409 while it is still queued or running."""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] not in FINISHED_STATES:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    if job["status"] != SUCCEEDED:
+        raise HTTPException(
+            status_code=409, detail=job["error"] or f"Job was {job['status']}"
+        )
+    return job["result"]
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job; finished jobs are returned unchanged."""
+    job = get_job_manager().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _public(job)
@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from starlette.responses import PlainTextResponse
+from metrics import render_prometheus
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics_route():
+    """Prometheus scrape endpoint: stage latencies, batch sizes, cache counters."""
+    return PlainTextResponse(
+        render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
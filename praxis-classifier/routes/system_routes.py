@@ -0,0 +1,30 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from classifier.cache import cache_stats
+from classifier.model_registry import model_stats, warmup_status
+from classifier.persistent_cache import get_result_cache
+
+router = APIRouter()
+
+
+@router.get("/ready")
+async def ready_route():
+    """Readiness probe: 200 once model warmup has finished, 503 until then."""
+    status = warmup_status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+@router.get("/models")
+async def models_route():
+    """Memory and load-time stats for every model loaded in this worker."""
+    return model_stats()
+
+
+@router.get("/cache")
+async def cache_route():
+    """Hit, miss and eviction counters for the inference caches."""
+    stats = cache_stats()
+    store = get_result_cache()
+    if store is not None:
+        stats["persistent"] = store.stats()
+    return stats
@@ -1,15 +1,18 @@
-import os
+import copy
 import re
 import json
-from google import genai
-from dotenv import load_dotenv
 
-load_dotenv()
-client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+from classifier.cache import TTLCache, content_key
+from config import LOCAL_RULE_EXTRACTION
+from metrics import inc, timed
+from rules.gemini_client import async_limit, get_async_client, get_client
+from rules.local_extractor import extract_rules_locally
 
+_rule_cache = TTLCache("rule_extraction")
 
-def extract_rules(description: str):
-    system_prompt = """
+GEMINI_MODEL = "models/gemini-2.5-flash"
+
+SYSTEM_PROMPT = """
     You are a rule extraction engine for Sage (a data quality evaluator).
     Given a description, you must extract structured JSON rules.
 
@@ -27,17 +30,77 @@ def extract_rules(description: str):
     ]
     """
 
+
+def _cache_key(description: str) -> str:
+    return content_key(" ".join(description.lower().split()))
+
+
+def _cached_or_local(description: str) -> tuple[list | None, str]:
+    """Rules from the cache or the local extractor, with their source; None on a miss."""
+    cached = _rule_cache.get(_cache_key(description))
+    if cached is not None:
+        return cached, "cache"
+    with timed("rule_extraction_local"):
+        rules = extract_rules_locally(description) if LOCAL_RULE_EXTRACTION else None
+    return rules, "local"
+
+
+def _remember(description: str, rules: list, source: str) -> list:
+    inc("praxis_rule_extractions_total", help_text="Rule extractions by source.", source=source)
+    if source != "cache":
+        _rule_cache.set(_cache_key(description), rules)
+    return copy.deepcopy(rules)
+
+
+def extract_rules(description: str, client=None):
+    """
+    Extract structured rules from a dataset description.
+    Results are memoized on the normalized description; common phrasings are
+    handled by the local extractor, and Gemini is only called on a miss.
+    Pass `client` to use a different (e.g. stubbed) Gemini client.
+    """
+    rules, source = _cached_or_local(description)
+    if rules is None:
+        with timed("rule_extraction_gemini"):
+            rules = extract_rules_with_gemini(description, client or get_client())
+        source = "gemini"
+    return _remember(description, rules, source)
+
+
+async def extract_rules_async(description: str, client=None):
+    """
+    extract_rules for the event loop: a Gemini miss is awaited on the async
+    client (`client.aio` when one is given), with at most the "gemini" model
+    concurrency calls in flight.
+    """
+    rules, source = _cached_or_local(description)
+    if rules is None:
+        aio = client.aio if client is not None else get_async_client()
+        async with async_limit():
+            with timed("rule_extraction_gemini"):
+                response = await aio.models.generate_content(
+                    model=GEMINI_MODEL, contents=_contents(description)
+                )
+        rules = parse_rules(response.text)
+        source = "gemini"
+    return _remember(description, rules, source)
+
+
+def _contents(description: str) -> list[dict]:
+    return [{"role": "user", "parts": [{"text": SYSTEM_PROMPT + "\n\n" + description}]}]
+
+
+def extract_rules_with_gemini(description: str, client):
     response = client.models.generate_content(
-        model="models/gemini-2.5-flash",
-        contents=[
-            {"role": "user", "parts": [{"text": system_prompt + "\n\n" + description}]}
-        ],
+        model=GEMINI_MODEL, contents=_contents(description)
     )
+    return parse_rules(response.text)
 
-    content = response.text.strip()
 
+def parse_rules(text: str) -> list:
+    """The JSON rule list in a Gemini reply, without any Markdown code fence."""
     content = re.sub(
-        r"^```(?:json)?|```$", "", content.strip(), flags=re.MULTILINE
+        r"^```(?:json)?|```$", "", text.strip(), flags=re.MULTILINE
     ).strip()
 
     try:
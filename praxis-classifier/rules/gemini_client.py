@@ -0,0 +1,52 @@
+import asyncio
+import os
+import threading
+from dotenv import load_dotenv
+
+from classifier.deadline import model_concurrency
+
+load_dotenv()
+
+_client = None
+_client_lock = threading.Lock()
+_async_limit = None
+
+
+def get_client():
+    """
+    Create the shared Gemini client on first use instead of at import time;
+    google.genai itself is only imported then.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            from google import genai
+
+            _client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+        return _client
+
+
+def get_async_client():
+    """
+    The asyncio interface of the shared client. It shares the client's HTTP
+    connection pool, so async calls reuse connections instead of opening one
+    per request.
+    """
+    return get_client().aio
+
+
+def async_limit() -> asyncio.Semaphore:
+    """Bounds concurrent async Gemini calls to the "gemini" model concurrency."""
+    global _async_limit
+    if _async_limit is None:
+        _async_limit = asyncio.Semaphore(model_concurrency("gemini"))
+    return _async_limit
+
+
+async def close_async_client() -> None:
+    """Close the async client's connections, if the client was ever created."""
+    with _client_lock:
+        client = _client
+    close = getattr(client.aio, "aclose", None) if client is not None else None
+    if close is not None:
+        await close()
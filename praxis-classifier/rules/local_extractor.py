@@ -0,0 +1,111 @@
+import re
+
+from rules.normalize_rules import normalize_rules_locally
+
+LANGUAGES = (
+    "english|french|spanish|german|italian|portuguese|dutch|russian|chinese|"
+    "japanese|korean|arabic|hindi|turkish|polish|swedish"
+)
+
+# "not in", "not be in", "not written in", "not be written in"
+NEGATED_IN = r"not\s+(?:be\s+)?(?:written\s+)?in"
+
+# (rule name, pattern); the first capture group is the rule value.
+PATTERNS = [
+    ("language", rf"\b({LANGUAGES})\s+only\b"),
+    ("language", rf"\bonly\s+(?:in\s+)?({LANGUAGES})\b"),
+    ("language", rf"\b(?:written|text|content|data|be)\s+in\s+({LANGUAGES})\b"),
+    ("excluded_language", rf"\b(?:no|{NEGATED_IN}|without|exclude|excluding)\s+({LANGUAGES})\b"),
+    ("min_length", r"\b(?:at\s+least|minimum(?:\s+of)?|min\.?|(?<!no )more\s+than)\s+(\d+)\s+words?\b"),
+    ("min_length", r"\b(\d+)\+?\s+words?\s+(?:minimum|or\s+more)\b"),
+    ("max_length", r"\b(?:at\s+most|maximum(?:\s+of)?|max\.?|no\s+more\s+than|under|fewer\s+than|less\s+than)\s+(\d+)\s+words?\b"),
+    ("max_length", r"\b(\d+)\s+words?\s+(?:maximum|or\s+(?:less|fewer))\b"),
+    ("toxicity", r"\b(no\s+(?:toxic|toxicity|offensive|hate)|non-?toxic|toxicity\s+(?:low|medium|high)|(?:low|medium|high)\s+toxicity)\b"),
+]
+COMPILED_PATTERNS = [(name, re.compile(pattern, re.IGNORECASE)) for name, pattern in PATTERNS]
+
+# Keyword lists run to the end of the sentence, so they are matched before the
+# sentence is split into clauses on commas.
+KEYWORD_PATTERN = re.compile(
+    r"\b(?:must\s+not|mustn't|should\s+not|shouldn't|cannot|can't|may\s+not|"
+    r"does\s+not|doesn't)\s+(?:contain|include|mention|use)\s+(?:the\s+|any\s+(?:of\s+)?)?"
+    r"(?:words?|terms?|keywords?)\s*:?\s+(.+)$"
+    r"|\b(?:banned|prohibited|forbidden|blocked)\s+(?:words?|terms?|keywords?)\s*:?\s+(.+)$",
+    re.IGNORECASE,
+)
+
+# A clause with one of these words states a requirement; if no pattern matched
+# it, the description holds something the local extractor does not understand.
+REQUIREMENT_CUES = re.compile(
+    r"\b(must|should|only|least|most|minimum|maximum|no|not|without|require[sd]?|"
+    r"exclude|avoid|prohibited|banned|forbidden)\b",
+    re.IGNORECASE,
+)
+
+# Left over once the matched phrases are cut out of a clause, any of these
+# means the patterns did not capture the whole requirement: a second language
+# or number, a qualifier ("not only ... but also", "or"), or a removal verb
+# that inverts it ("texts under 20 words are discarded").
+UNCOVERED_TERMS = re.compile(
+    rf"\b(?:{LANGUAGES}|\d+|or|either|also|only|no|not|never|without|least|most|"
+    r"minimum|maximum|fewer|less|more|under|over|words?|toxic\w*|offensive|hate|"
+    r"exclud\w*|avoid\w*|remov\w*|discard\w*|filter\w*|drop\w*|delet\w*|reject\w*|"
+    r"prohibited|banned|forbidden|requir\w*)\b",
+    re.IGNORECASE,
+)
+
+
+def _split(description: str) -> tuple[list[str], str | None]:
+    """Split into clauses, pulling out a prohibited keyword list if present."""
+    clauses, keywords = [], None
+    for sentence in re.split(r"[.;\n]+", description):
+        match = KEYWORD_PATTERN.search(sentence)
+        if match:
+            keywords = keywords or match.group(1) or match.group(2)
+            sentence = sentence[: match.start()]
+        clauses.extend(
+            clause.strip()
+            for clause in re.split(r",|\band\b", sentence)
+            if re.search(r"\w", clause)
+        )
+    return clauses, keywords
+
+
+def extract_rules_locally(description: str) -> list[dict] | None:
+    """
+    Deterministic, offline rule extraction for common phrasings such as
+    "English only", "at least 100 words" or "no toxic content".
+    Returns None when any requirement in the description is not recognised
+    in full, so the caller can fall back to Gemini.
+    """
+    clauses, keywords = _split(description)
+    found = {"prohibited_keywords": keywords} if keywords else {}
+    for clause in clauses:
+        matched = False
+        rest = clause
+        for name, pattern in COMPILED_PATTERNS:
+            match = pattern.search(clause)
+            if not match:
+                continue
+            matched = True
+            rest = rest[: match.start()] + " " * len(match.group(0)) + rest[match.end() :]
+            # Keep the first value per rule; "no English" must not also set language
+            if name == "language" and re.search(
+                rf"\b(?:no|{NEGATED_IN}|without|exclude|excluding)\s+{match.group(1)}\b",
+                clause,
+                re.IGNORECASE,
+            ):
+                continue
+            found.setdefault(name, match.group(1))
+
+        if not matched and REQUIREMENT_CUES.search(clause):
+            return None
+        if UNCOVERED_TERMS.search(rest):
+            return None
+
+    if not found:
+        return None
+
+    return normalize_rules_locally(
+        [{"name": name, "value": value, "weight": 1.0} for name, value in found.items()]
+    )
@@ -1,10 +1,10 @@
 import json
+import logging
 import re
-from google import genai
 
-client = genai.Client(
-    api_key="GEMINI_API_KEY",
-)
+from rules.gemini_client import get_client
+
+logger = logging.getLogger(__name__)
 
 ALLOWED_RULES = {
     "language": {"type": "string", "examples": ["English", "German", "French"]},
@@ -15,6 +15,25 @@ ALLOWED_RULES = {
     "prohibited_keywords": {"type": "list[string]", "examples": [["hate", "violence"]]},
 }
 
+NAME_MAP = {
+    "language": "language",
+    "english text": "language",
+    "lang": "language",
+    "wordcount": "min_length",
+    "word count": "min_length",
+    "min_words": "min_length",
+    "length": "min_length",
+    "min_length": "min_length",
+    "max_words": "max_length",
+    "max_length": "max_length",
+    "excluded_language": "excluded_language",
+    "disallowed_language": "excluded_language",
+    "toxicity": "toxicity",
+    "toxic": "toxicity",
+    "prohibited_keywords": "prohibited_keywords",
+    "banned_words": "prohibited_keywords",
+}
+
 SYSTEM_PROMPT = f"""
 You are a rule normalization system.
 Your task is to map messy or inconsistent rules into standardized JSON format.
@@ -38,12 +57,13 @@ Example Output:
 """
 
 
-def normalize_rules(rules: list[dict]) -> list[dict]:
+def normalize_rules(rules: list[dict], client=None) -> list[dict]:
     """
     Normalize extracted rules using Gemini for robust mapping.
     Falls back to local logic if Gemini fails or returns invalid JSON.
     """
     try:
+        client = client or get_client()
         response = client.models.generate.content(
             model="models/gemini-2.5-flash",
             messages=[
@@ -76,66 +96,66 @@ def normalize_rules(rules: list[dict]) -> list[dict]:
         return parsed
 
     except Exception as e:
-        print(f"⚠️ Gemini normalization failed, falling back to local logic: {e}")
+        logger.warning(
+            "Gemini normalization failed, falling back to local logic",
+            extra={"error": str(e)},
+        )
 
         # --- Step 3: Fallback to local normalization logic ---
-        name_map = {
-            "language": "language",
-            "english text": "language",
-            "lang": "language",
-            "wordcount": "min_length",
-            "word count": "min_length",
-            "min_words": "min_length",
-            "length": "min_length",
-            "min_length": "min_length",
-            "excluded_language": "excluded_language",
-            "disallowed_language": "excluded_language",
-            "toxicity": "toxicity",
-            "toxic": "toxicity",
-        }
-
-        normalized = []
-        for rule in rules:
-            name = str(rule.get("name", "")).lower().strip()
-            value = rule.get("value")
-            weight = rule.get("weight", None)
-
-            if name not in name_map:
-                continue
-            name = name_map[name]
-
-            if name == "language":
-                value = str(value).capitalize()
-            elif name == "min_length":
-                value = int(re.findall(r"\d+", str(value))[0]) if value else 0
-            elif name == "excluded_language":
-                value = str(value).capitalize()
-            elif name == "toxicity":
-                val = str(value).lower()
-                if "no" in val or "low" in val:
-                    value = "low"
-                elif "medium" in val:
-                    value = "medium"
-                elif "high" in val:
-                    value = "high"
-                else:
-                    value = "low"
-
-            if weight is None or weight <= 0:
-                weight = 0.0
-
-            normalized.append({"name": name, "value": value, "weight": float(weight)})
-
-        if not normalized:
-            return []
-
-        total_weight = sum(r["weight"] for r in normalized)
-        if total_weight == 0:
-            equal_weight = 1.0 / len(normalized)
-            for r in normalized:
-                r["weight"] = round(equal_weight, 2)
-        else:
-            for r in normalized:
-                r["weight"] = round(r["weight"] / total_weight, 2)
-
-        return normalized
+        return normalize_rules_locally(rules)
+
+
+def normalize_rule_value(name: str, value):
+    """Coerce a rule value to the type ALLOWED_RULES expects for `name`."""
+    if name in ("language", "excluded_language"):
+        return str(value).capitalize()
+    if name in ("min_length", "max_length"):
+        digits = re.findall(r"\d+", str(value))
+        return int(digits[0]) if digits else 0
+    if name == "toxicity":
+        val = str(value).lower()
+        if "no" in val or "low" in val:
+            return "low"
+        elif "medium" in val:
+            return "medium"
+        elif "high" in val:
+            return "high"
+        return "low"
+    if name == "prohibited_keywords":
+        if isinstance(value, str):
+            value = re.split(r",|\bor\b|\band\b", value)
+        return [str(v).strip().strip("\"'").lower() for v in value if str(v).strip()]
+    return value
+
+
+def normalize_rules_locally(rules: list[dict]) -> list[dict]:
+    """Map rule names through NAME_MAP, coerce values and rebalance weights."""
+    normalized = []
+    for rule in rules:
+        name = str(rule.get("name", "")).lower().strip()
+        value = rule.get("value")
+        weight = rule.get("weight", None)
+
+        if name not in NAME_MAP:
+            continue
+        name = NAME_MAP[name]
+        value = normalize_rule_value(name, value)
+
+        if weight is None or weight <= 0:
+            weight = 0.0
+
+        normalized.append({"name": name, "value": value, "weight": float(weight)})
+
+    if not normalized:
+        return []
+
+    total_weight = sum(r["weight"] for r in normalized)
+    if total_weight == 0:
+        equal_weight = 1.0 / len(normalized)
+        for r in normalized:
+            r["weight"] = round(equal_weight, 2)
+    else:
+        for r in normalized:
+            r["weight"] = round(r["weight"] / total_weight, 2)
+
+    return normalized
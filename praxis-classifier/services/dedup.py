@@ -0,0 +1,164 @@
+import random
+import re
+import zlib
+
+import numpy as np
+
+from config import DEDUP_MODE, LSH_BANDS, MINHASH_PERMUTATIONS, NEAR_DUP_THRESHOLD
+
+DEDUP_MODES = ("off", "exact", "near")
+
+SHINGLE_WORDS = 5
+MAX_SHINGLES = 5000  # per document; bounds signature cost on huge members
+# Mersenne prime below 2**31: a * x + b stays under 2**64 for 32-bit shingles,
+# so a whole signature is one vectorised uint64 expression
+_PRIME = (1 << 31) - 1
+_WORD = re.compile(r"\w+")
+
+
+def dedup_mode(mode: str = DEDUP_MODE) -> str:
+    """The effective mode; unknown values fall back to "exact"."""
+    return mode if mode in DEDUP_MODES else "exact"
+
+
+def _permutations(count: int, seed: int = 1) -> tuple[np.ndarray, np.ndarray]:
+    """Coefficients (a, b) of `count` hash functions, as column vectors."""
+    rng = random.Random(seed)
+    pairs = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(count)]
+    a, b = np.array(pairs, dtype=np.uint64).T
+    return a[:, None], b[:, None]
+
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> set[int]:
+    """CRC32 of every run of `size` consecutive lower-cased words."""
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {
+        zlib.crc32(" ".join(words[i : i + size]).encode("utf-8"))
+        for i in range(min(len(words) - size + 1, MAX_SHINGLES))
+    }
+
+
+class Deduplicator:
+    """
+    Groups the members of one evaluation into clusters of identical or
+    near-identical content, so only one representative per cluster is scored.
+
+    Exact duplicates are found by content hash. In "near" mode, MinHash
+    signatures over word shingles go into an LSH index of `bands` bands, and
+    a candidate joins a cluster when the estimated Jaccard similarity with
+    its representative reaches `threshold`.
+    """
+
+    def __init__(
+        self,
+        mode: str = DEDUP_MODE,
+        threshold: float = NEAR_DUP_THRESHOLD,
+        permutations: int = MINHASH_PERMUTATIONS,
+        bands: int = LSH_BANDS,
+    ):
+        self.mode = dedup_mode(mode)
+        self.threshold = threshold
+        self.bands = max(1, min(bands, permutations))
+        self.rows = max(1, permutations // self.bands)
+        self._perms = _permutations(self.bands * self.rows)
+
+        self._by_hash = {}  # content hash -> cluster id
+        self._buckets = {}  # (band, band values) -> [cluster ids]
+        self._signatures = []  # cluster id -> signature (near mode)
+        self._names = []  # cluster id -> representative member name
+        self._scores = []  # cluster id -> representative score, once known
+        self._fallbacks = set()  # cluster ids whose score is a model fallback
+        self.exact = 0
+        self.near = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def signature(self, text: str) -> np.ndarray:
+        values = shingles(text)
+        if not values:
+            return np.empty(0, dtype=np.uint64)
+        x = np.fromiter(values, dtype=np.uint64, count=len(values))
+        a, b = self._perms
+        return ((a * x + b) % _PRIME).min(axis=1)
+
+    def _bands(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows : (band + 1) * self.rows].tobytes()
+
+    def _similarity(self, left: np.ndarray, right: np.ndarray) -> float:
+        return float(np.count_nonzero(left == right)) / len(left)
+
+    def find(self, content_hash: str, text: str) -> tuple[int | None, np.ndarray | None]:
+        """
+        Return (cluster id, signature): the cluster this content belongs to,
+        or None with the signature to pass to add().
+        """
+        cluster = self._by_hash.get(content_hash)
+        if cluster is not None:
+            self.exact += 1
+            return cluster, None
+        if self.mode != "near":
+            return None, None
+
+        signature = self.signature(text)
+        if not signature.size:
+            return None, signature
+        for key in self._bands(signature):
+            for candidate in self._buckets.get(key, ()):
+                if self._similarity(signature, self._signatures[candidate]) >= self.threshold:
+                    self._by_hash[content_hash] = candidate
+                    self.near += 1
+                    return candidate, None
+        return None, signature
+
+    def add(self, content_hash: str, name: str, signature: np.ndarray | None = None) -> int:
+        """Register a member as the representative of a new cluster."""
+        cluster = len(self._names)
+        self._names.append(name)
+        self._scores.append(None)
+        self._signatures.append(signature)
+        self._by_hash[content_hash] = cluster
+        if signature is not None and signature.size:
+            for key in self._bands(signature):
+                self._buckets.setdefault(key, []).append(cluster)
+        return cluster
+
+    def set_score(self, cluster: int, score: float, fallback: bool = False) -> None:
+        self._scores[cluster] = score
+        if fallback:
+            self._fallbacks.add(cluster)
+
+    def score(self, cluster: int) -> float | None:
+        return self._scores[cluster]
+
+    def fell_back(self, cluster: int) -> bool:
+        return cluster in self._fallbacks
+
+    def representative(self, cluster: int) -> str:
+        return self._names[cluster]
+
+    def stats(self) -> dict:
+        clusters = len(self._names)
+        members = clusters + self.exact + self.near
+        return {
+            "mode": self.mode,
+            "clusters": clusters,
+            "exact_duplicates": self.exact,
+            "near_duplicates": self.near,
+            "duplicate_ratio": round((self.exact + self.near) / members, 4) if members else 0.0,
+        }
+
+
+def merge_stats(stats: list[dict]) -> dict:
+    """Combine the stats of several deduplicators (one per worker shard)."""
+    merged = {"mode": stats[0]["mode"] if stats else DEDUP_MODE}
+    for key in ("clusters", "exact_duplicates", "near_duplicates"):
+        merged[key] = sum(s[key] for s in stats)
+    duplicates = merged["exact_duplicates"] + merged["near_duplicates"]
+    members = merged["clusters"] + duplicates
+    merged["duplicate_ratio"] = round(duplicates / members, 4) if members else 0.0
+    return merged
@@ -0,0 +1,131 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import threading
+
+from config import PIPELINE_QUEUE, PIPELINE_WORKERS
+from metrics import inc, register_collector
+
+_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=max(1, PIPELINE_WORKERS), thread_name_prefix="praxis-pipeline"
+)
+_capacity = max(1, PIPELINE_WORKERS) + max(0, PIPELINE_QUEUE)
+_in_flight = 0
+_lock = threading.Lock()
+_DONE = object()
+
+
+class PipelineSaturated(Exception):
+    """Every pipeline thread is busy and the wait queue is full."""
+
+    retry_after = 1
+
+
+def reserve_slot() -> None:
+    """
+    Claim room for one unit of pipeline work, or raise PipelineSaturated.
+    Every successful call must be paired with release_slot().
+    """
+    global _in_flight
+    with _lock:
+        if _in_flight >= _capacity:
+            saturated = True
+        else:
+            _in_flight += 1
+            saturated = False
+    if saturated:
+        inc("praxis_requests_rejected_total", help_text="Requests turned away with a 429.")
+        raise PipelineSaturated(f"{_capacity} requests already running or queued")
+
+
+def release_slot(*_) -> None:
+    global _in_flight
+    with _lock:
+        _in_flight = max(0, _in_flight - 1)
+
+
+class PipelineSlot:
+    """
+    A slot claimed ahead of the work it is for, e.g. before an upload is
+    spooled, so a saturated pipeline rejects the request up front. Pass it
+    to run_in_pipeline(), which takes it over; release() gives it back if
+    it was never handed over and is a no-op otherwise.
+    """
+
+    def __init__(self):
+        reserve_slot()
+        self._held = True
+
+    def hand_over(self) -> None:
+        if not self._held:
+            reserve_slot()  # given back already; claim a fresh one
+        self._held = False
+
+    def release(self) -> None:
+        if self._held:
+            self._held = False
+            release_slot()
+
+
+async def run_in_pipeline(func, *args, slot: PipelineSlot | None = None, **kwargs):
+    """
+    Await `func(*args, **kwargs)` on the bounded pipeline threads instead of
+    the event loop. Raises PipelineSaturated at once when the pool and its
+    queue are full, unless a reserved `slot` is handed over. The slot is
+    held until the call returns, even if the caller stops waiting for it
+    first.
+    """
+    if slot is not None:
+        slot.hand_over()
+    else:
+        reserve_slot()
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    try:
+        future = _executor.submit(call)
+    except BaseException:
+        release_slot()
+        raise
+    future.add_done_callback(release_slot)
+    return await asyncio.wrap_future(future)
+
+
+async def iterate_in_pipeline(iterator):
+    """
+    Yield the items of a blocking iterator, each pulled on the pipeline
+    threads. The caller must have called reserve_slot(); the slot is released
+    once the iterator is exhausted or closed, also when the client goes away
+    mid-stream.
+    """
+    future = None
+    try:
+        while True:
+            future = _executor.submit(next, iterator, _DONE)
+            item = await asyncio.wrap_future(future)
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        # a generator cannot be closed while another thread is running it
+        def close(_=None):
+            try:
+                getattr(iterator, "close", lambda: None)()
+            finally:
+                release_slot()
+
+        if future is None:
+            close()
+        else:
+            future.add_done_callback(close)
+
+
+def _pipeline_samples() -> list[tuple]:
+    with _lock:
+        in_flight = _in_flight
+    return [
+        ("praxis_pipeline_in_flight", "gauge", "Pipeline calls running or queued.", {}, in_flight),
+        ("praxis_pipeline_capacity", "gauge", "Pipeline calls admitted before 429.", {}, _capacity),
+    ]
+
+
+register_collector(_pipeline_samples)
@@ -0,0 +1,149 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from classifier.cache import content_key
+from classifier.chunking import chunking_signature
+from classifier.rule_plan import RulePlan
+from config import FINGERPRINT_STORE_PATH, INFERENCE_BACKEND, MODEL_ID
+
+logger = logging.getLogger(__name__)
+
+_store = None
+_store_lock = threading.Lock()
+
+
+class FingerprintStore:
+    """
+    Per-member fingerprints and scores of evaluated datasets, in SQLite.
+    Rows are keyed by (dataset_id, rules_hash, name); a member is unchanged
+    when its ZIP CRC32 and size match, or its content hash matches any
+    stored member of the same dataset (renamed or moved files).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS members ("
+                "dataset_id TEXT NOT NULL, rules_hash TEXT NOT NULL, name TEXT NOT NULL, "
+                "crc INTEGER NOT NULL, size INTEGER NOT NULL, content_hash TEXT NOT NULL, "
+                "score REAL NOT NULL, updated_at REAL NOT NULL, "
+                "PRIMARY KEY (dataset_id, rules_hash, name))"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def load(self, dataset_id: str, rules_hash: str) -> dict:
+        """{name: {"crc", "size", "content_hash", "score"}} for a dataset."""
+        rows = (
+            self._connect()
+            .execute(
+                "SELECT name, crc, size, content_hash, score FROM members "
+                "WHERE dataset_id = ? AND rules_hash = ?",
+                (dataset_id, rules_hash),
+            )
+            .fetchall()
+        )
+        return {
+            name: {"crc": crc, "size": size, "content_hash": digest, "score": score}
+            for name, crc, size, digest, score in rows
+        }
+
+    def save(self, dataset_id: str, rules_hash: str, records: list[dict]) -> None:
+        """Insert or replace records with "name", "crc", "size", "content_hash", "score"."""
+        if not records:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO members "
+                "(dataset_id, rules_hash, name, crc, size, content_hash, score, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        dataset_id,
+                        rules_hash,
+                        r["name"],
+                        r["crc"],
+                        r["size"],
+                        r["content_hash"],
+                        r["score"],
+                        now,
+                    )
+                    for r in records
+                ],
+            )
+
+    def prune(self, dataset_id: str, rules_hash: str, keep: set[str]) -> int:
+        """
+        Drop rows of members no longer in the archive, and rows stored under
+        other rules for this dataset. Returns the number of rows removed.
+        """
+        stored = self.load(dataset_id, rules_hash)
+        gone = [(dataset_id, rules_hash, name) for name in stored if name not in keep]
+        with self._connect() as conn:
+            removed = conn.execute(
+                "DELETE FROM members WHERE dataset_id = ? AND rules_hash != ?",
+                (dataset_id, rules_hash),
+            ).rowcount
+            conn.executemany(
+                "DELETE FROM members WHERE dataset_id = ? AND rules_hash = ? AND name = ?",
+                gone,
+            )
+        return removed + len(gone)
+
+
+def get_fingerprint_store() -> FingerprintStore | None:
+    """Return the shared fingerprint store, or None when it is not configured."""
+    global _store
+    if not FINGERPRINT_STORE_PATH:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = FingerprintStore(FINGERPRINT_STORE_PATH)
+        return _store
+
+
+def rules_hash(rules) -> str | None:
+    """
+    Hash of everything a stored member score depends on: the rule list, the
+    model, the backend and the chunking settings. None for a precompiled
+    RulePlan, which has no stable serialized form.
+    """
+    if isinstance(rules, RulePlan):
+        return None
+    return content_key(
+        json.dumps(rules, sort_keys=True, default=str),
+        MODEL_ID,
+        INFERENCE_BACKEND,
+        chunking_signature(),
+    )
+
+
+def split_members(members: list, stored: dict) -> tuple[list, list]:
+    """
+    Partition ZipInfo members into (unchanged, changed) against stored
+    fingerprints, using only the archive's central directory: a member is
+    unchanged when its name, CRC32 and uncompressed size all match.
+    """
+    unchanged, changed = [], []
+    for info in members:
+        record = stored.get(info.filename)
+        if record and record["crc"] == info.CRC and record["size"] == info.file_size:
+            unchanged.append(info)
+        else:
+            changed.append(info)
+    return unchanged, changed
@@ -0,0 +1,372 @@
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from config import (
+    JOB_MAX_FINISHED,
+    JOB_STALE_SECONDS,
+    JOB_STORE_PATH,
+    JOB_TTL_SECONDS,
+    JOB_WORKERS,
+)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+STALE_ERROR = "worker stopped before the job finished"
+
+logger = logging.getLogger(__name__)
+
+
+def _new_job(job_id: str) -> dict:
+    return {
+        "job_id": job_id,
+        "status": QUEUED,
+        "progress": {"done": 0, "total": 0},
+        "error": None,
+        "result": None,
+        "created_at": time.time(),
+        "started_at": None,
+        "finished_at": None,
+        "heartbeat_at": time.time(),
+    }
+
+
+class InMemoryJobStore:
+    """
+    Job records held in a dict; lost on restart. Finished jobs are dropped
+    `ttl` seconds after they finish (0 keeps them) and beyond the newest
+    `max_finished`, so the dict does not grow with every job ever run.
+    """
+
+    def __init__(self, ttl: float = JOB_TTL_SECONDS, max_finished: int = JOB_MAX_FINISHED):
+        self.ttl = ttl
+        self.max_finished = max(0, max_finished)
+        self._jobs = {}
+        self._finished = OrderedDict()  # job_id -> finished_at, oldest first
+        self._lock = threading.Lock()
+
+    def create(self, job: dict) -> None:
+        with self._lock:
+            self._evict()
+            self._jobs[job["job_id"]] = dict(job)
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            self._evict()
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            if job_id in self._jobs:
+                self._apply(job_id, fields)
+
+    def transition(self, job_id: str, expected: str, **fields) -> bool:
+        """Apply `fields` only if the job's status is `expected`."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["status"] != expected:
+                return False
+            self._apply(job_id, fields)
+            return True
+
+    def touch(self, job_ids) -> None:
+        """Nothing to do: in-memory jobs cannot outlive their worker."""
+
+    def fail_stale(self, stale_after: float = JOB_STALE_SECONDS) -> int:
+        return 0
+
+    def _apply(self, job_id: str, fields: dict) -> None:
+        job = self._jobs[job_id]
+        job.update(fields)
+        if job["status"] in FINISHED_STATES and job_id not in self._finished:
+            self._finished[job_id] = job["finished_at"] or time.time()
+            self._evict()
+
+    def _evict(self) -> None:
+        expired_before = time.time() - self.ttl
+        while self._finished:
+            job_id, finished_at = next(iter(self._finished.items()))
+            if len(self._finished) <= self.max_finished and (
+                self.ttl <= 0 or finished_at >= expired_before
+            ):
+                break
+            del self._finished[job_id]
+            self._jobs.pop(job_id, None)
+
+
+class SqliteJobStore:
+    """
+    Job records in a SQLite file, so status survives restarts. Jobs left
+    queued or running by a worker that died are marked failed when the store
+    opens and whenever fail_stale() runs, once their heartbeat is older than
+    `stale_after` seconds; jobs of live workers sharing the file are kept.
+    """
+
+    def __init__(self, path: str, stale_after: float = JOB_STALE_SECONDS):
+        self.path = path
+        self.stale_after = stale_after
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (job_id TEXT PRIMARY KEY, data TEXT NOT NULL)"
+            )
+        failed = self.fail_stale(stale_after)
+        if failed:
+            logger.warning("failed jobs left behind by a stopped worker", extra={"jobs": failed})
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def create(self, job: dict) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, data) VALUES (?, ?)",
+                (job["job_id"], json.dumps(job)),
+            )
+
+    def get(self, job_id: str) -> dict | None:
+        row = (
+            self._connect()
+            .execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,))
+            .fetchone()
+        )
+        return json.loads(row[0]) if row else None
+
+    def update(self, job_id: str, **fields) -> None:
+        self.transition(job_id, None, **fields)
+
+    def transition(self, job_id: str, expected: str | None, **fields) -> bool:
+        """
+        Apply `fields` only if the stored status is `expected` (any status for
+        None). The write lock is taken before the row is read, so a change
+        written by another worker is never overwritten.
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT data FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            job = json.loads(row[0])
+            if expected is not None and job["status"] != expected:
+                return False
+            job.update(fields)
+            conn.execute(
+                "UPDATE jobs SET data = ? WHERE job_id = ?", (json.dumps(job), job_id)
+            )
+        return True
+
+    def touch(self, job_ids) -> None:
+        """Refresh the heartbeat of jobs this worker still owns."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE jobs SET data = json_set(data, '$.heartbeat_at', ?) WHERE job_id = ?",
+                [(now, job_id) for job_id in job_ids],
+            )
+
+    def fail_stale(self, stale_after: float = JOB_STALE_SECONDS) -> int:
+        """Mark queued or running jobs without a recent heartbeat as failed."""
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET data = json_set(data, '$.status', ?, '$.error', ?, "
+                "'$.finished_at', ?) "
+                "WHERE json_extract(data, '$.status') IN (?, ?) AND COALESCE("
+                "json_extract(data, '$.heartbeat_at'), json_extract(data, '$.started_at'), "
+                "json_extract(data, '$.created_at')) < ?",
+                (FAILED, STALE_ERROR, now, *ACTIVE_STATES, now - stale_after),
+            )
+        return cursor.rowcount
+
+
+class JobManager:
+    """
+    In-process queue of dataset evaluations, drained by background threads.
+    Each job evaluates a description and a spooled ZIP file, reporting
+    progress as members are scored. A heartbeat thread keeps this manager's
+    jobs from being taken for orphans by other workers sharing the store.
+    """
+
+    def __init__(self, store, workers: int = JOB_WORKERS, stale_after: float = JOB_STALE_SECONDS):
+        self.store = store
+        self.workers = max(1, workers)
+        self.stale_after = stale_after
+        self._queue = queue.Queue()
+        self._cancel_events = {}
+        self._threads = []
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            self._stopping.clear()
+            for i in range(self.workers):
+                thread = threading.Thread(
+                    target=self._run, name=f"praxis-job-{i}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+            thread = threading.Thread(
+                target=self._heartbeat, name="praxis-job-heartbeat", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stopping.set()
+            for event in self._cancel_events.values():
+                event.set()
+            for _ in range(self.workers):
+                self._queue.put(None)
+            threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join(timeout=5)
+
+    def submit(
+        self, description: str, zip_path: str, dataset_id: str | None = None
+    ) -> dict:
+        """Queue an evaluation. The job takes ownership of `zip_path`."""
+        self.start()
+        job = _new_job(uuid.uuid4().hex)
+        self.store.create(job)
+        with self._lock:
+            self._cancel_events[job["job_id"]] = threading.Event()
+        self._queue.put((job["job_id"], description, zip_path, dataset_id))
+        return job
+
+    def get(self, job_id: str) -> dict | None:
+        return self.store.get(job_id)
+
+    def cancel(self, job_id: str) -> dict | None:
+        job = self.store.get(job_id)
+        if job is None or job["status"] in FINISHED_STATES:
+            return job
+
+        with self._lock:
+            event = self._cancel_events.get(job_id)
+        if event is not None:
+            event.set()
+        self.store.transition(job_id, QUEUED, status=CANCELLED, finished_at=time.time())
+        return self.store.get(job_id)
+
+    def _heartbeat(self) -> None:
+        interval = max(1.0, self.stale_after / 4)
+        while not self._stopping.wait(interval):
+            with self._lock:
+                job_ids = list(self._cancel_events)
+            try:
+                self.store.touch(job_ids)
+                self.store.fail_stale(self.stale_after)
+            except sqlite3.Error as e:
+                logger.warning("job heartbeat failed", extra={"error": str(e)})
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            job_id, description, zip_path, dataset_id = item
+            try:
+                self._execute(job_id, description, zip_path, dataset_id)
+            finally:
+                with self._lock:
+                    self._cancel_events.pop(job_id, None)
+                try:
+                    os.unlink(zip_path)
+                except OSError:
+                    pass
+
+    def _execute(
+        self, job_id: str, description: str, zip_path: str, dataset_id: str | None
+    ) -> None:
+        # Imported here so the job store can be used without loading the models
+        from services.process_routes import (
+            combine_results,
+            evaluate_description,
+            evaluate_files,
+        )
+
+        with self._lock:
+            cancelled = self._cancel_events.get(job_id)
+        if cancelled is None or cancelled.is_set():
+            return
+
+        # only a job still queued in the store is started: another worker
+        # sharing it may have cancelled it meanwhile
+        now = time.time()
+        if not self.store.transition(
+            job_id, QUEUED, status=RUNNING, started_at=now, heartbeat_at=now
+        ):
+            return
+
+        def progress(done: int, total: int) -> None:
+            self.store.update(job_id, progress={"done": done, "total": total})
+
+        try:
+            desc_result = evaluate_description(description)
+            file_result = evaluate_files(
+                zip_path,
+                progress=progress,
+                should_stop=cancelled.is_set,
+                dataset_id=dataset_id,
+            )
+            if cancelled.is_set():
+                self.store.transition(job_id, RUNNING, status=CANCELLED, finished_at=time.time())
+                return
+
+            result = combine_results(desc_result, file_result)
+            self.store.transition(
+                job_id, RUNNING, status=SUCCEEDED, result=result, finished_at=time.time()
+            )
+        except Exception as e:
+            logger.exception("job failed", extra={"job_id": job_id})
+            self.store.transition(
+                job_id, RUNNING, status=FAILED, error=str(e), finished_at=time.time()
+            )
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Return the process-wide job manager, backed by SQLite when configured."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            store = SqliteJobStore(JOB_STORE_PATH) if JOB_STORE_PATH else InMemoryJobStore()
+            _manager = JobManager(store)
+        return _manager
+
+
+def shutdown_job_manager() -> None:
+    global _manager
+    with _manager_lock:
+        if _manager is not None:
+            _manager.stop()
+            _manager = None
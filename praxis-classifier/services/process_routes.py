@@ -1,20 +1,112 @@
-from classifier.ml_classifier import classify_text as ml_classifier
+import asyncio
+import logging
+
+from classifier.deadline import Deadline
+from classifier.micro_batcher import classify_text_coalesced as ml_classifier
 from classifier.final_score import fuse_results
-from rules.extract_rule import extract_rules
+from rules.extract_rule import extract_rules, extract_rules_async
 from classifier.evaluate_rules import evaluate_rules
-from services.read_files import process_zip_file
-
-
-def evaluate_description(description: str) -> dict:
-    """Evaluate description text using dynamic rules and ML classifier aligned with extracted rules."""
-    extracted_rules = extract_rules(description)
+from services.read_files import iter_zip_results, process_zip_file
+from services.executor import PipelineSlot, run_in_pipeline
+from services.sampling import estimate_dataset_score
+from config import INFERENCE_TIMEOUT_SECONDS, REQUEST_TIMEOUT_SECONDS, SAMPLE_TARGET_MARGIN
+from metrics import timed
+
+logger = logging.getLogger(__name__)
+
+# Static rules every dataset member is evaluated against
+DATASET_RULES = [
+    {"name": "language", "value": "English", "weight": 0.4},
+    {"name": "min_length", "value": 100, "weight": 0.3},
+    {"name": "toxicity", "value": "low", "weight": 0.3},
+]
+
+# Neutral score reported for a stage that produced nothing before its deadline
+FALLBACK_SCORE = 0.5
+
+
+def request_deadline() -> Deadline:
+    """A fresh deadline of PRAXIS_REQUEST_TIMEOUT seconds for one request."""
+    return Deadline(REQUEST_TIMEOUT_SECONDS)
+
+
+def backstop_timeout() -> float | None:
+    """
+    How long a route waits for a pipeline thread before giving up on it:
+    the request budget plus one inference call, which may still be running
+    when the deadline passes.
+    """
+    if REQUEST_TIMEOUT_SECONDS <= 0:
+        return None
+    return REQUEST_TIMEOUT_SECONDS + max(0, INFERENCE_TIMEOUT_SECONDS)
+
+
+async def run_until_deadline(
+    func, *args, fallback, slot: PipelineSlot | None = None, **kwargs
+):
+    """
+    Run a blocking pipeline function on the bounded pipeline threads and
+    return its result, or `fallback()` if it is still running after
+    backstop_timeout(). The thread is not killed, but a function given the
+    same deadline stops at its next checkpoint. Raises PipelineSaturated
+    when the pipeline is full and no reserved `slot` is passed.
+    """
+    try:
+        return await asyncio.wait_for(
+            run_in_pipeline(func, *args, slot=slot, **kwargs), backstop_timeout()
+        )
+    except asyncio.TimeoutError:
+        logger.warning("evaluation missed its deadline", extra={"stage": func.__name__})
+        return fallback()
+
+
+@timed("description_evaluation")
+def evaluate_description(description: str, deadline: Deadline | None = None) -> dict:
+    """
+    Evaluate description text using dynamic rules and ML classifier aligned with extracted rules.
+    When `deadline` runs out before classification finishes, neutral ML scores
+    are used and the result is marked partial.
+    """
+    return score_description(description, extract_rules(description), deadline)
+
+
+async def evaluate_description_async(
+    description: str, deadline: Deadline | None = None
+) -> dict:
+    """
+    evaluate_description for the async routes: rules are extracted on the
+    event loop with the async Gemini client, then scored on the bounded
+    pipeline threads. Raises PipelineSaturated when the pipeline is full.
+    """
+    with timed("description_evaluation"):
+        try:
+            extracted_rules = await asyncio.wait_for(
+                extract_rules_async(description),
+                deadline.remaining() if deadline is not None else None,
+            )
+        except asyncio.TimeoutError:
+            logger.warning("rule extraction missed its deadline")
+            return description_fallback()
+        return await run_until_deadline(
+            score_description,
+            description,
+            extracted_rules,
+            deadline,
+            fallback=description_fallback,
+        )
+
+
+def score_description(
+    description: str, extracted_rules: list[dict], deadline: Deadline | None = None
+) -> dict:
+    """Score a description against rules already extracted from it."""
     rule_results = evaluate_rules(extracted_rules, description)
 
     # ✅ Dynamically derive ML candidate labels from extracted rules
     candidate_labels = [rule["name"].lower() for rule in extracted_rules if "name" in rule]
 
     # 🧠 Only classify using the rules actually relevant to this text
-    ml_results = ml_classifier(description, candidate_labels)
+    ml_results = ml_classifier(description, candidate_labels, deadline=deadline)
 
     # Fuse both results
     final_result = fuse_results(rule_results, ml_results, labels=candidate_labels)
@@ -23,10 +115,15 @@ def evaluate_description(description: str) -> dict:
     ml_score = ml_results.get("confidence", 0.0)
     fused_score = final_result.get("combined_score", (rule_score + ml_score) / 2)
 
-    print("Extracted Rules:", extracted_rules)
-    print("Rule Results:", rule_results)
-    print("ML Results:", ml_results)
-    print("Final Fused Result:", final_result)
+    logger.info(
+        "description evaluated",
+        extra={
+            "extracted_rules": extracted_rules,
+            "rule_score": rule_results.get("weighted_score"),
+            "ml_results": ml_results,
+            "combined_score": final_result.get("combined_score"),
+        },
+    )
 
     return {
         "extracted_rules": extracted_rules,
@@ -34,23 +131,95 @@ def evaluate_description(description: str) -> dict:
         "ml_results": ml_results,
         "final_result": final_result,
         "score": min(max(fused_score, 0.0), 1.0),  # normalized 0–1
+        "partial": bool(deadline and deadline.degraded),
+        "degraded": list(deadline.reasons) if deadline else [],
     }
 
 
-def evaluate_files(file_bytes: bytes) -> dict:
-    """Evaluate uploaded ZIP dataset using static or extracted rules."""
-    rules = [
-        {"name": "language", "value": "English", "weight": 0.4},
-        {"name": "min_length", "value": 100, "weight": 0.3},
-        {"name": "toxicity", "value": "low", "weight": 0.3},
-    ]
+def description_fallback() -> dict:
+    """Result for a description whose evaluation did not finish in time."""
+    return {
+        "extracted_rules": [],
+        "rule_results": {},
+        "ml_results": {},
+        "final_result": {},
+        "score": FALLBACK_SCORE,
+        "partial": True,
+        "degraded": ["deadline"],
+    }
+
 
-    result = process_zip_file(file_bytes, rules)
+@timed("dataset_evaluation")
+def evaluate_files(
+    zip_source,
+    progress=None,
+    should_stop=None,
+    deadline: Deadline | None = None,
+    dataset_id: str | None = None,
+    sample: bool = False,
+    margin: float | None = None,
+) -> dict:
+    """
+    Evaluate uploaded ZIP dataset using static or extracted rules.
+    `zip_source` may be a path to a spooled upload, a file object or bytes.
+    `progress`, `should_stop`, `deadline` and `dataset_id` are passed through
+    to process_zip_file. With `sample`, dataset_score is instead estimated
+    from a stratified sample to within ±`margin` (PRAXIS_SAMPLE_MARGIN by
+    default) and reported with its confidence interval.
+    """
+    if sample:
+        result = estimate_dataset_score(
+            zip_source,
+            DATASET_RULES,
+            target_margin=SAMPLE_TARGET_MARGIN if margin is None else margin,
+            deadline=deadline,
+        )
+        return {
+            "file_results": result,
+            "dataset_score": min(max(result["dataset_score"], 0.0), 1.0),
+            "partial": result["partial"],
+        }
+
+    result = process_zip_file(
+        zip_source,
+        DATASET_RULES,
+        progress=progress,
+        should_stop=should_stop,
+        deadline=deadline,
+        dataset_id=dataset_id,
+    )
     dataset_score = result.get("dataset_score", 0.0)
 
     return {
         "file_results": result,
         "dataset_score": min(max(dataset_score, 0.0), 1.0),  # normalize 0–1
+        "partial": result.get("partial", False),
+    }
+
+
+def iter_file_results(
+    zip_source, deadline: Deadline | None = None, dataset_id: str | None = None
+):
+    """
+    Evaluate a ZIP dataset like evaluate_files, yielding each member's record
+    (rule breakdown, ML scores, combined score) as soon as it is scored and
+    a summary record last. Nothing but the current group is held in memory.
+    """
+    records = iter_zip_results(
+        zip_source, DATASET_RULES, deadline=deadline, dataset_id=dataset_id
+    )
+    for record in records:
+        if record["type"] == "summary":
+            record["dataset_score"] = min(max(record["dataset_score"], 0.0), 1.0)
+        yield record
+
+
+def files_fallback() -> dict:
+    """Result for a dataset whose evaluation did not finish in time."""
+    return {
+        "file_results": {"partial": True, "degraded": ["deadline"]},
+        "dataset_score": FALLBACK_SCORE,
+        "partial": True,
     }
 
 
@@ -78,7 +247,8 @@ def combine_results(desc_result: dict, file_result: dict) -> dict:
         "dataset_score": dataset_score,
         "unified_score": unified_score,
         "label": label,
+        "partial": bool(desc_result.get("partial") or file_result.get("partial")),
     }
 
-    print("Final Unified Evaluation:", unified_score)
+    logger.info("unified evaluation", extra={"unified_score": unified_score, "label": label})
     return output
@@ -1,36 +1,530 @@
-import zipfile
+import codecs
+import concurrent.futures
+import csv
 import io
-from transformers import pipeline
-from classifier.evaluate_text import evaluate_text
-from classifier.ml_classifier import classify_text
+import logging
+import os
+import sqlite3
+import zipfile
+from classifier.cache import content_key
+from classifier.deadline import Deadline
+from classifier.evaluate_text import evaluate_text_batch
+from classifier.ml_classifier import FallbackScores, classify_batch
 from classifier.final_score import fuse_results as final_scores
+from classifier.rule_plan import RulePlan, compile_rules
+from config import (
+    INFERENCE_BATCH_SIZE,
+    MAX_MEMBER_BYTES,
+    PARALLEL_MIN_FILES,
+    READ_CHUNK_BYTES,
+    STREAM_GROUP_FILES,
+    STRUCTURED_READERS,
+)
+from services.dedup import Deduplicator, dedup_mode, merge_stats
+from services.fingerprints import get_fingerprint_store, rules_hash, split_members
+from services.structured import (
+    STRUCTURED_EXTENSIONS,
+    RecordSample,
+    is_structured,
+    read_records,
+)
+from services.worker_pool import get_worker_pool
+from metrics import timed
 
+logger = logging.getLogger(__name__)
 
-def load_lightweight_model():
-    return pipeline("zero-shot-classification", model="typeform/distilbert-base-uncased-mnli", device=1)
+SUPPORTED_EXTENSIONS = (".txt", ".md") + STRUCTURED_EXTENSIONS
 
-def process_zip_file(zip_bytes: bytes, rules: list[dict]) -> dict:
-    results, total_score, file_count = {}, 0.0, 0
-    model = load_lightweight_model()
 
-    with zipfile.ZipFile(io.BytesIO(zip_bytes)) as z:
-        for file_name in z.namelist():
-            if not file_name.lower().endswith((".txt", ".md", ".csv", ".json")):
-                continue
+def open_zip(source) -> zipfile.ZipFile:
+    """Open a ZIP from a path, a seekable file object or raw bytes."""
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    return zipfile.ZipFile(source)
+
+
+@timed("zip_decode")
+def read_member(
+    z: zipfile.ZipFile,
+    info: zipfile.ZipInfo,
+    max_bytes: int = MAX_MEMBER_BYTES,
+    chunk_size: int = READ_CHUNK_BYTES,
+) -> str:
+    """
+    Decode a ZIP member in bounded chunks, keeping at most `max_bytes` of it.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    parts, remaining = [], max_bytes
+    with z.open(info) as member:
+        while remaining > 0:
+            chunk = member.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            parts.append(decoder.decode(chunk))
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts).strip()
+
+
+def list_members(z: zipfile.ZipFile) -> list[zipfile.ZipInfo]:
+    """Supported members of an archive, in archive order, without reading them."""
+    return [
+        info
+        for info in z.infolist()
+        if not info.is_dir() and info.filename.lower().endswith(SUPPORTED_EXTENSIONS)
+    ]
+
+
+def _read_content(z: zipfile.ZipFile, info: zipfile.ZipInfo):
+    """
+    A member's text, or for CSV/JSON/JSON Lines members a RecordSample of
+    record texts. Structured members that fail to parse are read as text.
+    """
+    if STRUCTURED_READERS and is_structured(info.filename):
+        try:
+            return read_records(z, info)
+        except (ValueError, csv.Error, UnicodeError) as e:
+            logger.warning(
+                "structured read failed, scoring as text",
+                extra={"file_name": info.filename, "error": str(e)},
+            )
+    return read_member(z, info)
+
+
+def _read_members(z: zipfile.ZipFile, members: list[zipfile.ZipInfo]):
+    for info in members:
+        content = _read_content(z, info)
+        if not content:
+            continue
+
+        yield info.filename, content
+
 
-            content = z.open(file_name).read().decode("utf-8", errors="ignore").strip()
-            if not content:
+def iter_zip_members(source, names: list[str] | None = None):
+    """
+    Lazily yield (file_name, content) for every supported, non-empty member,
+    or only for `names` when given. Content is a string, or a RecordSample
+    (a list of record texts) for structured members. Only one member is
+    decoded at a time.
+    """
+    with open_zip(source) as z:
+        members = list_members(z) if names is None else [z.getinfo(n) for n in names]
+        yield from _read_members(z, members)
+
+
+def score_details(
+    contents: list[str],
+    rules,
+    batch_size: int = INFERENCE_BATCH_SIZE,
+    deadline: Deadline | None = None,
+) -> list[dict]:
+    """
+    Rule breakdown, ML scores and combined score for each text, computed in
+    batched forward passes. Returns {"score", "rule_score", "rules", "ml"} per
+    text, plus "fallback": True when a model stage gave a neutral stand-in.
+    """
+    rule_results = evaluate_text_batch(
+        contents, rules, batch_size=batch_size, deadline=deadline
+    )
+    ml_results = classify_batch(
+        contents, ["english", "non-toxic"], batch_size=batch_size, deadline=deadline
+    )
+
+    details = []
+    for rule_result, ml_result in zip(rule_results, ml_results):
+        rule_score = rule_result.get("weighted_score", 0.0)
+        ml_score = sum(ml_result.values()) / len(ml_result)
+        detail = {
+            "score": round((0.7 * rule_score) + (0.3 * ml_score), 3),
+            "rule_score": rule_score,
+            "rules": rule_result,
+            "ml": dict(ml_result),
+        }
+        if isinstance(ml_result, FallbackScores) or any(
+            isinstance(raw, dict) and raw.get("fallback") for raw in rule_result.values()
+        ):
+            detail["fallback"] = True
+        details.append(detail)
+    return details
+
+
+def score_contents(
+    contents: list[str],
+    rules,
+    batch_size: int = INFERENCE_BATCH_SIZE,
+    deadline: Deadline | None = None,
+) -> list[float]:
+    """Combined rule + ML score for each text, computed in batched forward passes."""
+    return [detail["score"] for detail in score_details(contents, rules, batch_size, deadline)]
+
+
+def score_members(
+    items: list[tuple[str, str]],
+    rules,
+    batch_size: int = INFERENCE_BATCH_SIZE,
+    deadline: Deadline | None = None,
+    known: dict | None = None,
+    dedup: Deduplicator | None = None,
+) -> list[dict]:
+    """
+    Score (name, text) pairs. Returns one record per pair: "name",
+    "content_hash" and the score_details fields. Texts whose content hash is
+    in `known` take the score stored there instead of being run through the
+    models, and are flagged "reused". With a `dedup`, only the first member
+    of each duplicate cluster is scored; the others copy its score and name
+    it in "duplicate_of", so each cluster counts once per member in the mean.
+    Records whose score rests on a model fallback are flagged "fallback".
+    """
+    records, pending, duplicates = [], [], []
+    for name, content in items:
+        texts = content if isinstance(content, list) else [content]
+        record = {"name": name, "content_hash": content_key(*texts)}
+        records.append(record)
+        if known and record["content_hash"] in known:
+            record["score"] = known[record["content_hash"]]
+            record["reused"] = True
+            continue
+
+        cluster = None
+        if dedup is not None and dedup.enabled:
+            cluster, signature = dedup.find(record["content_hash"], " ".join(texts))
+            if cluster is not None:
+                duplicates.append((record, cluster))
                 continue
+            cluster = dedup.add(record["content_hash"], name, signature)
+        pending.append((record, content, texts, cluster))
+
+    # every text of the group, including all sampled records, in one batch
+    details = score_details(
+        [text for _, _, texts, _ in pending for text in texts],
+        rules,
+        batch_size=batch_size,
+        deadline=deadline,
+    )
+    offset = 0
+    for record, content, texts, cluster in pending:
+        member_details = details[offset : offset + len(texts)]
+        offset += len(texts)
+        if isinstance(content, RecordSample):
+            record.update(_aggregate(member_details, content))
+        else:
+            record.update(member_details[0])
+        if cluster is not None:
+            dedup.set_score(cluster, record["score"], record.get("fallback", False))
+
+    for record, cluster in duplicates:
+        record["score"] = dedup.score(cluster)
+        record["duplicate_of"] = dedup.representative(cluster)
+        if dedup.fell_back(cluster):
+            record["fallback"] = True
+    return records
+
+
+def _aggregate(details: list[dict], sample: RecordSample) -> dict:
+    """Per-file summary of a structured member's record scores."""
+    count = len(details)
+    pass_rates = {}
+    for detail in details:
+        for name, result in detail["rules"].items():
+            if isinstance(result, dict) and "score" in result:
+                # an undecided rule counts as half a pass, like its score
+                pass_rates[name] = pass_rates.get(name, 0) + result["score"] / count
+    ml = {}
+    for detail in details:
+        for label, score in detail["ml"].items():
+            ml[label] = ml.get(label, 0.0) + score / count
+
+    aggregate = {
+        "score": round(sum(d["score"] for d in details) / count, 3),
+        "rule_score": round(sum(d["rule_score"] for d in details) / count, 3),
+        "rules": {name: {"pass_rate": round(rate, 3)} for name, rate in pass_rates.items()},
+        "ml": {label: round(score, 3) for label, score in ml.items()},
+        "records": {"seen": sample.seen, "scored": count},
+    }
+    if any(detail.get("fallback") for detail in details):
+        aggregate["fallback"] = True
+    return aggregate
+
+
+def _score_shard(
+    zip_path: str,
+    start: int,
+    names: list[str],
+    rules: RulePlan,
+    batch_size: int,
+    deadline: Deadline | None = None,
+    known: dict | None = None,
+) -> tuple[int, list[dict] | None, list[str], dict | None]:
+    """
+    Worker-process task: score one shard of members of the archive.
+    Returns the shard offset, its records (None when the deadline passed
+    before the shard started), the stages that fell back and the shard's
+    duplicate stats. The parent puts members with equal CRC32 and size in
+    the same shard, so exact copies are confirmed here by content hash;
+    near-duplicates are only found within a shard.
+    """
+    if deadline is not None and deadline.expired():
+        return start, None, [], None
+    dedup = Deduplicator()
+    items = list(iter_zip_members(zip_path, names))
+    records = score_members(items, rules, batch_size, deadline, known, dedup)
+    return start, records, deadline.reasons if deadline is not None else [], dedup.stats()
+
+
+def _score_parallel(
+    pool,
+    zip_path: str,
+    shards: list[list[str]],
+    rules: RulePlan,
+    batch_size: int,
+    should_stop=None,
+    deadline: Deadline | None = None,
+    known: dict | None = None,
+    duplicates: list | None = None,
+):
+    """
+    Score shards of member names on the process pool. Yields (shard_start,
+    records, members_in_shard) as shards finish, where shard_start is the
+    shard's offset in `shards` order; callers that need a deterministic
+    order sort by it. Each shard's duplicate stats are appended to
+    `duplicates`.
+    """
+    futures, start = {}, 0
+    for names in shards:
+        future = pool.submit(
+            _score_shard, zip_path, start, names, rules, batch_size, deadline, known
+        )
+        futures[future] = (start, len(names))
+        start += len(names)
+
+    try:
+        for future in concurrent.futures.as_completed(futures):
+            start, shard_records, reasons, stats = future.result()
+            if deadline is not None:
+                for reason in reasons:
+                    deadline.degrade(reason)
+            if stats is not None and duplicates is not None:
+                duplicates.append(stats)
+            if shard_records is not None:
+                yield start, shard_records, futures[future][1]
+            if should_stop and should_stop():
+                return
+    finally:
+        # also reached when the consumer stops iterating early
+        for pending in futures:
+            pending.cancel()
+
+
+def _shard_members(members: list[zipfile.ZipInfo]) -> list[list[str]]:
+    """
+    Cut members into shards of about STREAM_GROUP_FILES names. Unless dedup
+    is off, members sharing CRC32 and size go to the same shard, so its
+    Deduplicator can confirm copies by content hash; a CRC match alone is
+    not proof, and copies split across shards would each be scored.
+    """
+    grouped = dedup_mode() != "off"
+    candidates = {}
+    for info in members:
+        key = (info.CRC, info.file_size) if grouped else info.filename
+        candidates.setdefault(key, []).append(info.filename)
+
+    shards, shard = [], []
+    for names in candidates.values():
+        if shard and len(shard) + len(names) > STREAM_GROUP_FILES:
+            shards.append(shard)
+            shard = []
+        shard.extend(names)
+    if shard:
+        shards.append(shard)
+    return shards
+
+
+def _score_serial(
+    z: zipfile.ZipFile,
+    members: list[zipfile.ZipInfo],
+    rules: RulePlan,
+    batch_size: int,
+    should_stop=None,
+    deadline: Deadline | None = None,
+    known: dict | None = None,
+    dedup: Deduplicator | None = None,
+):
+    """
+    Score members group by group in this process, yielding
+    (group_start, records, members_in_group). The deadline is also checked
+    between members while a group is decoded, so a group cut short is
+    scored as far as it got.
+    """
+    for start in range(0, len(members), STREAM_GROUP_FILES):
+        if should_stop and should_stop():
+            return
+
+        group = members[start : start + STREAM_GROUP_FILES]
+        if deadline is not None:
+            kept = []
+            for info in group:
+                if deadline.expired():
+                    break
+                kept.append(info)
+            group = kept
+        items = list(_read_members(z, group))
+        records = score_members(items, rules, batch_size, deadline, known, dedup)
+        yield start, records, len(group)
+
+
+def iter_zip_results(
+    zip_source,
+    rules: list[dict],
+    batch_size: int = INFERENCE_BATCH_SIZE,
+    progress=None,
+    should_stop=None,
+    deadline: Deadline | None = None,
+    dataset_id: str | None = None,
+):
+    """
+    Score a ZIP dataset given as a path, file object or bytes, yielding one
+    {"type": "file", ...} record per member as soon as its group is scored,
+    then a final {"type": "summary", ...} record.
+
+    Members stream through in groups of STREAM_GROUP_FILES, so peak memory
+    depends on the group size, not on the archive size. Large archives on
+    disk are sharded across the worker pool when PRAXIS_WORKERS is set.
+
+    `progress(done, total)` is called after every group of members and
+    `should_stop()` is checked between groups; when it returns True the
+    summary covers only the members scored so far. Once `deadline` passes,
+    scoring stops the same way. The summary is marked `partial` when members
+    were skipped or any model stage fell back, and `degraded` lists why.
+
+    With a `dataset_id` and PRAXIS_FINGERPRINT_PATH set, members unchanged
+    since the last evaluation of that dataset under the same rules are not
+    read again: their stored scores are reused and only new or changed
+    members are scored, so the cost follows the size of the diff.
+
+    Members whose content duplicates one already scored in this run (by
+    content hash, or by MinHash similarity with PRAXIS_DEDUP=near) take the
+    representative's score without another inference call; the summary's
+    `duplicates` reports how many were collapsed.
+    """
+    # without one, model fallbacks would go unrecorded and the summary
+    # would claim a complete result
+    deadline = deadline if deadline is not None else Deadline(None)
+    fingerprint = rules_hash(rules) if dataset_id else None
+    rules = compile_rules(rules)
+    store = get_fingerprint_store() if fingerprint else None
+
+    def stop() -> bool:
+        if should_stop is not None and should_stop():
+            return True
+        return deadline.expired()
+
+    with open_zip(zip_source) as z:
+        members = list_members(z)
+
+        stored, known = {}, None
+        dedup, shard_duplicates = None, []
+        if store is not None:
+            try:
+                stored = store.load(dataset_id, fingerprint)
+            except sqlite3.Error as e:
+                logger.warning("fingerprint store read failed", extra={"error": str(e)})
+            known = {record["content_hash"]: record["score"] for record in stored.values()}
+        unchanged, changed = split_members(members, stored)
+
+        shard_scores = {-1: [stored[info.filename]["score"] for info in unchanged]}
+        for info in unchanged:
+            yield {
+                "type": "file",
+                "name": info.filename,
+                "score": stored[info.filename]["score"],
+                "reused": True,
+            }
+
+        pool = get_worker_pool()
+        if (
+            pool is not None
+            and isinstance(zip_source, (str, os.PathLike))
+            and len(changed) >= PARALLEL_MIN_FILES
+        ):
+            groups = _score_parallel(
+                pool, zip_source, _shard_members(changed), rules, batch_size,
+                stop, deadline, known, shard_duplicates,
+            )
+        else:
+            dedup = Deduplicator()
+            groups = _score_serial(z, changed, rules, batch_size, stop, deadline, known, dedup)
+
+        done, reused, fresh = len(unchanged), len(unchanged), []
+        for start, records, count in groups:
+            shard_scores[start] = [record["score"] for record in records]
+            done += count
+            for record in records:
+                reused += bool(record.get("reused"))
+                # fallback scores from failed or timed-out inference are not kept
+                if store is not None and not record.get("fallback"):
+                    fresh.append({key: record[key] for key in ("name", "content_hash", "score")})
+                yield {"type": "file", **record}
+            if progress:
+                progress(done, len(members))
+
+    completed = done == len(members)
+    if not completed and deadline.expired():
+        deadline.degrade("deadline")
+    degraded = list(deadline.reasons)
+
+    if store is not None:
+        _store_fingerprints(store, dataset_id, fingerprint, members, fresh)
+
+    # sum in shard order, so the score does not depend on which worker finishes first
+    scores = [score for start in sorted(shard_scores) for score in shard_scores[start]]
+    dataset_score = round(sum(scores) / len(scores), 3) if scores else 0.0
+    yield {
+        "type": "summary",
+        "dataset_score": dataset_score,
+        "files_total": len(members),
+        "files_done": done,
+        "files_reused": reused,
+        "completed": completed,
+        "partial": not completed or bool(degraded),
+        "degraded": degraded,
+        "duplicates": merge_stats(shard_duplicates) if dedup is None else dedup.stats(),
+    }
 
-            rule_result = evaluate_text(content, rules)
-            ml_result = classify_text(content, ["english", "non-toxic"])
 
-            rule_score = rule_result.get("weighted_score", 0.0)
-            ml_score = sum(ml_result.values()) / len(ml_result)
-            combined_score = round((0.7 * rule_score) + (0.3 * ml_score), 3)
+def process_zip_file(
+    zip_source,
+    rules: list[dict],
+    batch_size: int = INFERENCE_BATCH_SIZE,
+    progress=None,
+    should_stop=None,
+    deadline: Deadline | None = None,
+    dataset_id: str | None = None,
+) -> dict:
+    """
+    Score a ZIP dataset and return only the summary of iter_zip_results:
+    dataset_score, file counts and completeness. Per-file records are
+    dropped as they are produced.
+    """
+    summary = {}
+    for record in iter_zip_results(
+        zip_source, rules, batch_size, progress, should_stop, deadline, dataset_id
+    ):
+        if record["type"] == "summary":
+            summary = record
+    summary = dict(summary)
+    summary.pop("type", None)
+    return summary
 
-            total_score += combined_score
-            file_count += 1
 
-    dataset_score = round(total_score / file_count, 3) if file_count else 0.0
-    return {"dataset_score": dataset_score}
+def _store_fingerprints(store, dataset_id, fingerprint, members, records) -> None:
+    """Persist freshly scored members and forget members no longer in the archive."""
+    infos = {info.filename: info for info in members}
+    fresh = [
+        {**record, "crc": infos[record["name"]].CRC, "size": infos[record["name"]].file_size}
+        for record in records
+    ]
+    try:
+        store.save(dataset_id, fingerprint, fresh)
+        store.prune(dataset_id, fingerprint, set(infos))
+    except sqlite3.Error as e:
+        logger.warning("fingerprint store write failed", extra={"error": str(e)})
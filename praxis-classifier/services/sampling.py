@@ -0,0 +1,199 @@
+import bisect
+import math
+import os
+import random
+from statistics import NormalDist
+
+from classifier.deadline import Deadline
+from classifier.rule_plan import compile_rules
+from config import (
+    INFERENCE_BATCH_SIZE,
+    SAMPLE_CONFIDENCE,
+    SAMPLE_ROUND_FILES,
+    SAMPLE_TARGET_MARGIN,
+)
+from services.read_files import _read_members, list_members, open_zip, score_members
+
+# Uncompressed size boundaries of the size strata, in bytes
+SIZE_EDGES = (1_024, 10_240, 102_400, 1_048_576)
+
+
+class Stratum:
+    """Members sharing an extension and size class, in a random draw order."""
+
+    def __init__(self, key: tuple, members: list):
+        self.key = key
+        self.members = members
+        self.drawn = 0
+        self.empty = 0
+        self.scores = []
+
+    @property
+    def remaining(self) -> int:
+        return len(self.members) - self.drawn
+
+    @property
+    def size(self) -> float:
+        """Members expected to be non-empty, from the empties drawn so far."""
+        if not self.drawn:
+            return len(self.members)
+        return len(self.members) * (self.drawn - self.empty) / self.drawn
+
+    def mean(self) -> float:
+        return sum(self.scores) / len(self.scores)
+
+    def variance(self) -> float | None:
+        n = len(self.scores)
+        if n < 2:
+            return None
+        mean = self.mean()
+        return sum((s - mean) ** 2 for s in self.scores) / (n - 1)
+
+    def draw(self, count: int) -> list:
+        members = self.members[self.drawn : self.drawn + count]
+        self.drawn += len(members)
+        return members
+
+
+def stratify(members: list, rng: random.Random) -> list[Stratum]:
+    groups = {}
+    for info in members:
+        extension = os.path.splitext(info.filename)[1].lower()
+        size_class = bisect.bisect_right(SIZE_EDGES, info.file_size)
+        groups.setdefault((extension, size_class), []).append(info)
+    strata = []
+    for key in sorted(groups):
+        rng.shuffle(groups[key])
+        strata.append(Stratum(key, groups[key]))
+    return strata
+
+
+def allocate(strata: list[Stratum], count: int) -> list:
+    """
+    Draw about `count` more members. The first draw takes at least two from
+    every stratum so each has a variance estimate; after that, members go
+    to strata in proportion to size times standard deviation (Neyman
+    allocation), which shrinks the interval fastest.
+    """
+    open_strata = [s for s in strata if s.remaining]
+    if not open_strata:
+        return []
+
+    # 0.5 is the largest possible standard deviation of a score in [0, 1]
+    weights = [s.size * math.sqrt(s.variance() or 0.25) for s in open_strata]
+    total = sum(weights) or float(len(open_strata))
+    drawn = []
+    for stratum, weight in zip(open_strata, weights):
+        share = math.ceil(count * (weight or 1.0) / total)
+        if len(stratum.scores) < 2:
+            share = max(share, 2)
+        drawn.extend(stratum.draw(share))
+    return drawn
+
+
+def stratified_estimate(strata: list[Stratum], z_value: float) -> tuple[float, float]:
+    """
+    Stratified mean of the member scores and the half-width of its
+    confidence interval, with the finite population correction so a fully
+    scored stratum contributes no uncertainty.
+    """
+    sampled = [s for s in strata if s.scores]
+    if not sampled:
+        return 0.0, 1.0
+
+    all_scores = [score for s in sampled for score in s.scores]
+    pooled_mean = sum(all_scores) / len(all_scores)
+    pooled = (
+        sum((x - pooled_mean) ** 2 for x in all_scores) / (len(all_scores) - 1)
+        if len(all_scores) > 1
+        else 0.25
+    )
+
+    population = sum(s.size for s in sampled)
+    mean, variance = 0.0, 0.0
+    for s in sampled:
+        weight = s.size / population
+        n = len(s.scores)
+        mean += weight * s.mean()
+        fpc = max(0.0, 1 - n / s.size) if s.size else 0.0
+        s2 = s.variance()
+        variance += weight**2 * fpc * (pooled if s2 is None else s2) / n
+
+    # strata with nothing scored yet add full uncertainty
+    if any(not s.scores and s.remaining for s in strata):
+        return mean, 1.0
+    return mean, z_value * math.sqrt(variance)
+
+
+def estimate_dataset_score(
+    zip_source,
+    rules,
+    target_margin: float = SAMPLE_TARGET_MARGIN,
+    confidence: float = SAMPLE_CONFIDENCE,
+    batch_size: int = INFERENCE_BATCH_SIZE,
+    deadline: Deadline | None = None,
+    seed: int = 0,
+) -> dict:
+    """
+    Approximate dataset_score from a stratified random sample of members
+    (strata by extension and size class). Members are scored in rounds of
+    SAMPLE_ROUND_FILES, at least one, until the `confidence` interval is within
+    ±`target_margin`, every member is scored, or `deadline` passes.
+    Returns the estimate with its interval and the sample size.
+    """
+    # record model fallbacks even when the caller set no time budget
+    deadline = deadline if deadline is not None else Deadline(None)
+    rules = compile_rules(rules)
+    z_value = NormalDist().inv_cdf(0.5 + confidence / 2)
+    rng = random.Random(seed)
+
+    with open_zip(zip_source) as z:
+        members = list_members(z)
+        strata = stratify(members, rng)
+        by_name = {info.filename: s for s in strata for info in s.members}
+
+        estimate, margin = 0.0, 1.0
+        # always score a first round: margin starts at 1.0, which a loose
+        # target would otherwise accept without scoring anything
+        while True:
+            if deadline.expired():
+                deadline.degrade("deadline")
+                break
+            draw = allocate(strata, max(1, SAMPLE_ROUND_FILES))
+            if not draw:
+                break
+
+            records = score_members(list(_read_members(z, draw)), rules, batch_size, deadline)
+            scored = {record["name"] for record in records}
+            for record in records:
+                by_name[record["name"]].scores.append(record["score"])
+            for info in draw:
+                if info.filename not in scored:
+                    by_name[info.filename].empty += 1
+            estimate, margin = stratified_estimate(strata, z_value)
+            if margin <= target_margin:
+                break
+
+    degraded = list(deadline.reasons)
+    sample_size = sum(len(s.scores) for s in strata)
+    nothing_to_score = not sample_size and not any(s.remaining for s in strata)
+    if nothing_to_score:
+        margin = 0.0  # as in exact mode
+    completed = (sample_size > 0 or nothing_to_score) and margin <= target_margin
+    return {
+        "dataset_score": round(estimate, 3),
+        "confidence_interval": [
+            round(max(0.0, estimate - margin), 3),
+            round(min(1.0, estimate + margin), 3),
+        ],
+        "margin": round(margin, 4),
+        "confidence": confidence,
+        "sample_size": sample_size,
+        "files_sampled": sum(s.drawn for s in strata),
+        "files_total": len(members),
+        "strata": len(strata),
+        "sampled": True,
+        "completed": completed,
+        "partial": not completed or bool(degraded),
+        "degraded": degraded,
+    }
@@ -0,0 +1,191 @@
+import csv
+import io
+import json
+import random
+import re
+import zipfile
+
+from config import (
+    MAX_MEMBER_BYTES,
+    READ_CHUNK_BYTES,
+    STRUCTURED_MAX_RECORDS,
+    STRUCTURED_TEXT_FIELDS,
+)
+from metrics import timed
+
+STRUCTURED_EXTENSIONS = (".csv", ".json", ".jsonl", ".ndjson")
+
+_SKIP_SPACE = re.compile(r"\s*")
+_SKIP_SEPARATORS = re.compile(r"[\s,]*")
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+# A single CSV cell may hold a whole document
+csv.field_size_limit(max(MAX_MEMBER_BYTES, 131072))
+
+
+class RecordSample(list):
+    """Texts sampled from a structured member; `seen` counts every record read."""
+
+    def __init__(self, texts=(), seen: int = 0):
+        super().__init__(texts)
+        self.seen = seen
+
+
+def is_structured(name: str) -> bool:
+    return name.lower().endswith(STRUCTURED_EXTENSIONS)
+
+
+def record_text(record, fields: tuple[str, ...] = STRUCTURED_TEXT_FIELDS) -> str:
+    """
+    The text to score for one record: the first of `fields` present
+    (case-insensitive), otherwise every string value joined together.
+    """
+    if isinstance(record, str):
+        return record
+    if isinstance(record, dict):
+        lowered = {str(key).lower(): value for key, value in record.items()}
+        for field in fields:
+            value = lowered.get(field)
+            if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+                return str(value)
+        return " ".join(value for value in record.values() if isinstance(value, str))
+    if isinstance(record, list):
+        return " ".join(value for value in record if isinstance(value, str))
+    return ""
+
+
+def iter_csv_texts(stream, fields: tuple[str, ...] = STRUCTURED_TEXT_FIELDS):
+    """Yield the text of each CSV row, reading `stream` one row at a time."""
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if header is None:
+        return
+    lowered = [name.strip().lower() for name in header]
+    column = next((lowered.index(f) for f in fields if f in lowered), None)
+    for row in reader:
+        if column is not None:
+            if column < len(row):
+                yield row[column]
+        else:
+            yield " ".join(cell for cell in row if cell)
+
+
+def iter_json_values(stream, chunk_size: int = READ_CHUNK_BYTES):
+    """
+    Yield the elements of a top-level JSON array one at a time, holding only
+    the current element in memory. Any other document is parsed whole (up
+    to MAX_MEMBER_BYTES); for an object, its longest list of records is used.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+
+    def fill():
+        # the only place consumed text is dropped, once per chunk read
+        nonlocal buffer, pos, eof
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+    while not eof and _SKIP_SPACE.match(buffer).end() == len(buffer):
+        fill()
+    pos = _SKIP_SPACE.match(buffer).end()
+    if pos == len(buffer):
+        return
+
+    if buffer[pos] != "[":
+        document = json.loads(buffer[pos:] + stream.read(MAX_MEMBER_BYTES))
+        if isinstance(document, dict):
+            lists = [value for value in document.values() if isinstance(value, list)]
+            if lists:
+                yield from max(lists, key=len)
+                return
+        yield document
+        return
+
+    pos += 1
+    while True:
+        pos = _SKIP_SEPARATORS.match(buffer, pos).end()
+        if pos == len(buffer):
+            if eof:
+                return
+            fill()
+            continue
+        if buffer[pos] == "]":
+            return
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            fill()
+            continue
+        # a number at the end of the buffer may continue in the next chunk
+        if (
+            not eof
+            and isinstance(value, (int, float))
+            and not isinstance(value, bool)
+            and (end == len(buffer) or buffer[end] in _NUMBER_CHARS)
+        ):
+            fill()
+            continue
+        yield value
+        pos = end
+
+
+def iter_jsonl_values(stream):
+    """Yield one parsed value per non-blank line; malformed lines are skipped."""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            continue
+
+
+def sample(texts, max_records: int, seed: int = 0) -> RecordSample:
+    """
+    Reservoir-sample up to `max_records` non-empty texts from an iterable of
+    unknown length, keeping their original order. Memory is bounded by the
+    sample, not by the input.
+    """
+    rng = random.Random(seed)
+    reservoir, seen = [], 0
+    for text in texts:
+        text = text.strip() if text else ""
+        if not text:
+            continue
+        if len(reservoir) < max_records:
+            reservoir.append((seen, text))
+        else:
+            slot = rng.randint(0, seen)
+            if slot < max_records:
+                reservoir[slot] = (seen, text)
+        seen += 1
+    return RecordSample((text for _, text in sorted(reservoir)), seen=seen)
+
+
+@timed("structured_decode")
+def read_records(
+    z: zipfile.ZipFile,
+    info: zipfile.ZipInfo,
+    fields: tuple[str, ...] = STRUCTURED_TEXT_FIELDS,
+    max_records: int = STRUCTURED_MAX_RECORDS,
+) -> RecordSample:
+    """
+    Stream a CSV, JSON or JSON Lines member record by record and return a
+    sample of up to `max_records` record texts. The sample is seeded by the
+    member name, so re-reading the same member gives the same records.
+    """
+    name = info.filename.lower()
+    with z.open(info) as member:
+        stream = io.TextIOWrapper(member, encoding="utf-8-sig", errors="ignore", newline="")
+        if name.endswith(".csv"):
+            texts = iter_csv_texts(stream, fields)
+        elif name.endswith(".json"):
+            texts = (record_text(value, fields) for value in iter_json_values(stream))
+        else:
+            texts = (record_text(value, fields) for value in iter_jsonl_values(stream))
+        return sample(texts, max(1, max_records), seed=info.filename)
@@ -0,0 +1,35 @@
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from fastapi import UploadFile
+
+from config import READ_CHUNK_BYTES
+
+
+async def spool_upload(upload: UploadFile, suffix: str = ".zip") -> str:
+    """
+    Copy an upload to a temporary file in bounded chunks and return its path.
+    The caller owns the file and must remove it.
+    """
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+        try:
+            while chunk := await upload.read(READ_CHUNK_BYTES):
+                tmp.write(chunk)
+        except Exception:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+        return tmp.name
+
+
+@asynccontextmanager
+async def spooled_upload(upload: UploadFile, suffix: str = ".zip"):
+    """Spool an upload to disk for the duration of the block."""
+    path = await spool_upload(upload, suffix=suffix)
+    try:
+        yield path
+    finally:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
@@ -0,0 +1,44 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from config import POOL_WORKERS, TORCH_THREADS
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker(torch_threads: int):
+    """Runs once in every worker process: pin torch threads and load the model."""
+    import torch
+    from classifier.model_registry import warmup
+
+    torch.set_num_threads(torch_threads)
+    torch.set_num_interop_threads(1)
+    warmup()
+
+
+def get_worker_pool() -> ProcessPoolExecutor | None:
+    """Return the shared process pool, or None when PRAXIS_WORKERS is 0."""
+    global _pool
+    if POOL_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: forking a process that already holds torch
+            # thread pools can deadlock
+            _pool = ProcessPoolExecutor(
+                max_workers=POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(TORCH_THREADS,),
+            )
+        return _pool
+
+
+def shutdown_worker_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
@@ -0,0 +1,27 @@
+import pytest
+
+pytest.importorskip("optimum.onnxruntime")
+transformers = pytest.importorskip("transformers")
+
+from classifier import backends
+from config import MODEL_ID
+
+
+@pytest.fixture(scope="module", autouse=True)
+def model_available():
+    try:
+        transformers.AutoConfig.from_pretrained(MODEL_ID)
+    except OSError as e:
+        pytest.skip(f"{MODEL_ID} is not available: {e}")
+
+
+@pytest.fixture(autouse=True)
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(backends, "BACKEND_MODEL_PATH", str(tmp_path))
+
+
+@pytest.mark.parametrize("name", ["onnx", "onnx-int8"])
+def test_backend_matches_torch(name):
+    report = backends.check_parity(name, MODEL_ID)
+
+    assert report["passed"], report
@@ -0,0 +1,119 @@
+import pytest
+
+from rules import extract_rule
+from rules.extract_rule import extract_rules
+
+
+class StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubModels:
+    def __init__(self, reply: str):
+        self.reply = reply
+        self.calls = []
+
+    def generate_content(self, model, contents):
+        self.calls.append(contents)
+        return StubResponse(self.reply)
+
+
+class StubClient:
+    """Stands in for the Gemini client; records every generate_content call."""
+
+    def __init__(self, reply: str = "[]"):
+        self.models = StubModels(reply)
+
+    @property
+    def calls(self) -> int:
+        return len(self.models.calls)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(extract_rule, "LOCAL_RULE_EXTRACTION", True)
+    extract_rule._rule_cache.clear()
+    yield
+    extract_rule._rule_cache.clear()
+
+
+def test_local_path_does_not_call_gemini():
+    client = StubClient()
+    rules = extract_rules("English only, at least 100 words.", client=client)
+
+    assert client.calls == 0
+    assert {rule["name"]: rule["value"] for rule in rules} == {
+        "language": "English",
+        "min_length": 100,
+    }
+
+
+@pytest.mark.parametrize(
+    "description, language",
+    [
+        ("The dataset must not be in German.", "German"),
+        ("Text must not be written in French.", "French"),
+        ("Content not in Spanish.", "Spanish"),
+        ("No Italian.", "Italian"),
+    ],
+)
+def test_negated_language_is_excluded(description, language):
+    client = StubClient()
+    rules = extract_rules(description, client=client)
+
+    assert client.calls == 0
+    assert rules == [{"name": "excluded_language", "value": language, "weight": 1.0}]
+
+
+@pytest.mark.parametrize(
+    "description",
+    [
+        "English text with fewer than 20 words is discarded.",
+        "Reviews with high toxicity are removed.",
+        "Not only English but also French.",
+        "Text should be in English or French.",
+    ],
+)
+def test_partially_matched_requirement_falls_back_to_gemini(description):
+    client = StubClient('[{"name": "language", "value": "English", "weight": 1.0}]')
+    extract_rules(description, client=client)
+
+    assert client.calls == 1
+
+
+def test_filler_words_around_a_match_stay_local():
+    client = StubClient()
+    rules = extract_rules(
+        "Text must be written in English and contain at least 50 words, no toxic content.",
+        client=client,
+    )
+
+    assert client.calls == 0
+    assert {rule["name"] for rule in rules} == {"language", "min_length", "toxicity"}
+
+
+def test_unrecognised_requirement_falls_back_to_gemini():
+    reply = '```json\n[{"name": "toxicity", "value": "low", "weight": 1.0}]\n```'
+    client = StubClient(reply)
+    rules = extract_rules("Rows should sound upbeat and friendly.", client=client)
+
+    assert client.calls == 1
+    assert rules == [{"name": "toxicity", "value": "low", "weight": 1.0}]
+
+
+def test_invalid_gemini_reply_raises():
+    client = StubClient("not json")
+    with pytest.raises(ValueError):
+        extract_rules("Rows should sound upbeat and friendly.", client=client)
+
+
+def test_cache_hit_skips_extraction():
+    reply = '[{"name": "toxicity", "value": "low", "weight": 1.0}]'
+    client = StubClient(reply)
+    first = extract_rules("Rows should sound upbeat.", client=client)
+    first[0]["value"] = "changed"
+    second = extract_rules("  rows SHOULD sound   upbeat. ", client=client)
+
+    assert client.calls == 1
+    assert second == [{"name": "toxicity", "value": "low", "weight": 1.0}]
@@ -0,0 +1,45 @@
+import zipfile
+
+import pytest
+
+from services import sampling
+from services.sampling import estimate_dataset_score
+
+RULES = [{"name": "min_length", "value": 1, "weight": 1.0}]
+
+
+@pytest.fixture(autouse=True)
+def fixed_scores(monkeypatch):
+    """Score every member 0.8 without running the models."""
+    calls = []
+
+    def score_members(items, rules, batch_size, deadline):
+        calls.append(len(items))
+        return [{"name": name, "score": 0.8} for name, _ in items]
+
+    monkeypatch.setattr(sampling, "score_members", score_members)
+    return calls
+
+
+def make_zip(path, count):
+    with zipfile.ZipFile(path, "w") as z:
+        for i in range(count):
+            z.writestr(f"doc{i}.txt", f"document number {i}")
+    return str(path)
+
+
+def test_loose_margin_still_scores_a_first_round(tmp_path, fixed_scores):
+    result = estimate_dataset_score(make_zip(tmp_path / "data.zip", 20), RULES, target_margin=1.0)
+
+    assert fixed_scores
+    assert result["sample_size"] > 0
+    assert result["dataset_score"] == 0.8
+    assert result["completed"]
+
+
+def test_empty_archive_completes_without_scoring(tmp_path, fixed_scores):
+    result = estimate_dataset_score(make_zip(tmp_path / "empty.zip", 0), RULES, target_margin=1.0)
+
+    assert not fixed_scores
+    assert result["sample_size"] == 0
+    assert result["completed"]
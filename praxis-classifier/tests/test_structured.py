@@ -0,0 +1,22 @@
+import io
+import json
+
+import pytest
+
+from services.structured import iter_json_values
+
+DOCUMENT = '[12345, -6.5e3, true, false, null, {"text": "a, b"}, "str]ing", 7, 0.25]'
+
+
+@pytest.mark.parametrize("chunk_size", range(1, 12))
+def test_values_split_across_chunks(chunk_size):
+    values = list(iter_json_values(io.StringIO(DOCUMENT), chunk_size=chunk_size))
+
+    assert values == json.loads(DOCUMENT)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3])
+def test_number_ending_the_array_is_read_whole(chunk_size):
+    values = list(iter_json_values(io.StringIO("[1, 23456789]"), chunk_size=chunk_size))
+
+    assert values == [1, 23456789]